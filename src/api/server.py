@@ -1,13 +1,18 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from pathlib import Path
 from typing import List
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from datetime import datetime
+from dataclasses import fields
 
 from models.shared_models import (
     Location,
@@ -16,7 +21,8 @@ from models.shared_models import (
     RouteAnalysisResult as RouteResponse,
     ScheduleEntry
 )
-from models.config import Config, MapConfig, SolveConfig
+from models.config import Config, MapConfig, SolveConfig, load_config_file
+from functools import lru_cache
 from models.location_registry import LocationRegistry
 from solvers.solvers import SOLVERS, DEFAULT_SOLVER_ID
 from cvrp import CVRP
@@ -124,10 +130,18 @@ async def optimize_routes(
                 print(f"Warning: Failed to generate road paths for schedule {base_id}: {str(path_error)}")
                 final_results.extend(sorted_days)  # Add results without road paths
 
+        # orjson serializes dataclasses and datetimes natively, without the intermediate dicts
+        if orjson is not None:
+            return Response(
+                content=orjson.dumps(final_results, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+                media_type="application/json"
+            )
+
         # Convert datetime objects and encode to JSON
         serializable_results = []
         for result in final_results:
-            result_dict = result.__dict__
+            # Analysis dataclasses use slots, so build the dict from their fields
+            result_dict = {f.name: getattr(result, f.name) for f in fields(result) if not f.name.startswith('_')}
             result_dict['date_generated'] = result_dict['date_generated'].isoformat()
             serializable_results.append(result_dict)
 
@@ -161,42 +175,45 @@ async def get_default_config():
     try:
         config_path = Path(__file__).parent.parent.parent / 'default_config.json'
         if config_path.exists():
-            with open(config_path) as f:
-                config_data = json.load(f)
-                return Config(**config_data)
+            return load_config_file(config_path)
         
-        # Fallback config if file doesn't exist
-        return Config(
-            map=MapConfig(
-                center=(7.0707, 125.6087),  # Davao City center
-                zoom_level=13,
-                path_weight=5,
-                path_opacity=0.6
-            ),
-            schedules=[
-                ScheduleEntry(
-                    id="default",
-                    name="Default Schedule",
-                    frequency=7,
-                    file="default_schedule.csv",
-                    color="#FF0000",
-                    icon="fas fa-trash"
-                )
-            ],
-            locations=[],
-            settings=SolveConfig(
-                solver=DEFAULT_SOLVER_ID,
-                vehicles=[],
-                depot_location=(7.099907716684531, 125.58941003079195),
-                constraints=RouteConstraints(one_way_roads=[])
-            )
-        )
+        # Fallback config if file doesn't exist; copied so requests never share the cached one
+        return _fallback_config().copy(deep=True)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to load default config: {str(e)}"
         )
 
+@lru_cache(maxsize=1)
+def _fallback_config() -> Config:
+    """Default configuration used when default_config.json is missing, validated once"""
+    return Config(
+        map=MapConfig(
+            center=(7.0707, 125.6087),  # Davao City center
+            zoom_level=13,
+            path_weight=5,
+            path_opacity=0.6
+        ),
+        schedules=[
+            ScheduleEntry(
+                id="default",
+                name="Default Schedule",
+                frequency=7,
+                file="default_schedule.csv",
+                color="#FF0000",
+                icon="fas fa-trash"
+            )
+        ],
+        locations=[],
+        settings=SolveConfig(
+            solver=DEFAULT_SOLVER_ID,
+            vehicles=[],
+            depot_location=(7.099907716684531, 125.58941003079195),
+            constraints=RouteConstraints(one_way_roads=[])
+        )
+    )
+
 # Catch-all route for SPA client-side routing
 @app.get("/{full_path:path}")
 async def serve_frontend(full_path: str, request: Request):
@@ -1,17 +1,23 @@
 from typing import List, Set, Tuple, Iterable, Dict
 from models.location import Vehicle, RouteConstraints, VehicleRoute
-from models.shared_models import ScheduleEntry, Location, TripAnalysisResult
+from models.shared_models import ScheduleEntry, Location, TripAnalysisResult, CollectionStop
 from models.trip_collection import TripCollection, CollectionData
 from models.location_registry import LocationRegistry
 from models.route_data import RouteAnalysisResult, VehicleRouteInfo, StopInfo
 from solvers.base_solver import BaseSolver
-from solvers.or_tools_solver import ORToolsSolver
+from solvers.solvers import ORTOOLS_SOLVER_ID
 from scheduling.collection_scheduler import CollectionScheduler
-from utils import calculate_distance, AVERAGE_SPEED_KPH
+from utils import calculate_distance, calculate_distance_matrix, AVERAGE_SPEED_KPH
 from datetime import datetime
+from itertools import accumulate
+import logging
+import numpy as np
+import sys
 
 from utils import MAX_DAILY_TIME, estimate_travel_time
 
+logger = logging.getLogger(__name__)
+
 class CVRP:
     def __init__(self, vehicles: List[Vehicle], solver_class: BaseSolver, constraints: RouteConstraints | None = None, allow_multiple_trips: bool = True, max_daily_time: int = MAX_DAILY_TIME):
         self.vehicles = vehicles
@@ -20,17 +26,57 @@ class CVRP:
         self.constraints = constraints or RouteConstraints(one_way_roads=[])
         self.collection_scheduler = None  # Will be initialized during process
         self.max_daily_time = max_daily_time  # Max daily time in minutes
+        self._depot_coords = np.array([v.depot_location for v in vehicles], dtype=np.float64).reshape(-1, 2)
+        self._loc_id_to_idx: Dict[str, int] = {}  # Column of each location in the distance matrix
+        self._dist_depot_loc = np.empty((len(vehicles), 0))  # (vehicles, locations) depot distances
+        self._loc_dist_matrix: np.ndarray | None = None  # (locations, locations) distances, only needed by OR-Tools
+
+        # The solver is fixed for the lifetime of this instance, so pick the optimization strategy once
+        if solver_class and solver_class.id == ORTOOLS_SOLVER_ID:
+            self._optimize_impl = self._optimize_ortools
+        else:
+            self._optimize_impl = self._optimize_per_vehicle
 
     def _initialize_location_registry(self, locations: LocationRegistry) -> LocationRegistry:
         """Initialize location registry with depot distances"""
-        depot_location = self.vehicles[0].depot_location
-        
-        # Process location data
-        for loc in locations:
-            loc.distance_from_depot = calculate_distance(depot_location, loc.coordinates)
+        all_locations = locations.get_all()
+        coords = locations.coordinates_array()  # Row i holds the coordinates of all_locations[i]
+
+        # Compute the distances from every vehicle depot to every location
+        # in one vectorized pass and keep them around for later lookups
+        self._loc_id_to_idx = {loc.id: idx for idx, loc in enumerate(all_locations)}
+        self._dist_depot_loc = calculate_distance_matrix(self._depot_coords, coords)
+
+        # OR-Tools reads arc costs from a matrix, so build the location-to-location block once per run
+        if self._optimize_impl == self._optimize_ortools:
+            self._loc_dist_matrix = calculate_distance_matrix(coords, coords)
+
+        # Depot distances are measured from the first vehicle's depot
+        for loc, distance in zip(all_locations, self._dist_depot_loc[0]):
+            loc.distance_from_depot = float(distance)
         
         return locations
 
+    def _nearest_neighbor_route(self, vehicle: Vehicle, locations: List[Location]) -> List[Location]:
+        """Order a single vehicle's locations by always visiting the nearest unvisited one next"""
+        stops = [loc for loc in locations if loc is not None]
+        coords = [vehicle.depot_location] + [loc.coordinates for loc in stops]
+        distances = calculate_distance_matrix(coords, coords)
+
+        # Index 0 is the depot, which is where the route starts
+        visited = np.zeros(len(coords), dtype=bool)
+        visited[0] = True
+        current = 0
+
+        route = [None]  # Depot placeholder
+        for _ in stops:
+            current = int(np.argmin(np.where(visited, np.inf, distances[current])))
+            visited[current] = True
+            route.append(stops[current - 1])
+        route.append(None)
+
+        return route
+
     def optimize_routes(self, vehicle_assignments: List[List[LocationRegistry]], stop_time = 15, speed_kph = AVERAGE_SPEED_KPH) -> List[List[Location]]:
         """Optimize routes using solver after scheduler assignments"""
         if not self.solver_class:
@@ -40,69 +86,101 @@ class CVRP:
 
         minimum_optimization_threshold = 5
         if total_locations < minimum_optimization_threshold:
-            print("Not enough locations to optimize. Returning original assignments.")
+            logger.debug("Not enough locations to optimize. Returning original assignments.")
             return vehicle_assignments
 
-        should_print = total_locations <= minimum_optimization_threshold
+        # A short route for a single vehicle is not worth OR-Tools' setup cost. Nearest neighbor
+        # ordering ignores one-way roads, capacity and the daily time limit, so it is only used
+        # when none of them can matter; otherwise the solver runs as usual.
+        single_vehicle_threshold = 10
+        nonempty = [(v_idx, locations) for v_idx, locations in enumerate(vehicle_assignments) if locations]
+        if (self._optimize_impl == self._optimize_ortools
+                and not self.constraints.one_way_roads
+                and len(nonempty) == 1 and len(nonempty[0][1]) <= single_vehicle_threshold):
+            v_idx, locations = nonempty[0]
+            vehicle = self.vehicles[v_idx]
+            stops = [loc for loc in locations if loc is not None]
+            if sum(loc.wco_amount for loc in stops) <= vehicle.capacity:
+                route = self._nearest_neighbor_route(vehicle, locations)
+
+                # Service time at every stop plus the depot-to-depot travel time of the tour
+                path = [vehicle.depot_location] + [loc.coordinates for loc in route if loc is not None] + [vehicle.depot_location]
+                route_distance = sum(calculate_distance(a, b) for a, b in zip(path, path[1:]))
+                route_time = len(stops) * stop_time + estimate_travel_time(route_distance, speed_kph)
+                if route_time <= self.max_daily_time:
+                    logger.debug("Only vehicle %s has work. Using nearest neighbor ordering instead of solver.", vehicle.id)
+                    optimized_assignments = [[] for _ in vehicle_assignments]
+                    optimized_assignments[v_idx] = route
+                    return optimized_assignments
+
+        should_print = total_locations <= minimum_optimization_threshold and logger.isEnabledFor(logging.DEBUG)
         if should_print:
             # Print all locations
-            print("Locations to optimize:")
+            logger.debug("Locations to optimize:")
             for assignments in vehicle_assignments:
                 for loc in assignments:
                     if loc is not None:
-                        print(f"  - {loc.name} (ID: {loc.id})")
-
-        # If instanceof solver is ORToolsSolver, then use it in parallel to all vehicles
-        print(f'Using solver: {self.solver_class.name}')
-
-        if self.solver_class.id == ORToolsSolver.id:
-            print('uses or-tools solver')
-            list_of_locations: List[Location] = []
-
-            # Flatten the list of locations
-            for locations in vehicle_assignments:
-                list_of_locations.extend([loc for loc in locations if loc is not None])
-
-            solver = self.solver_class(
-                locations=list_of_locations,
-                vehicles=self.vehicles,
-                constraints=self.constraints,
-                speed_kph=speed_kph,
-                stop_time=stop_time,
-                max_daily_time=self.max_daily_time
-            )
+                        logger.debug("  - %s (ID: %s)", loc.name, loc.id)
 
-            vehicle_routes = solver.solve()
-            if total_locations < 6:
-                # Print all locations
-                print("Optimized locations:")
-                for new_assignments in vehicle_routes:
-                    for loc in new_assignments:
-                        if loc is not None:
-                            print(f"  - {loc.name} (ID: {loc.id})")
+        logger.debug('Using solver: %s', self.solver_class.name)
+        return self._optimize_impl(vehicle_assignments, stop_time, speed_kph, should_print)
 
-            return vehicle_routes
+    def _optimize_ortools(self, vehicle_assignments: List[List[Location]], stop_time: float, speed_kph: float, should_print: bool) -> List[List[Location]]:
+        """Optimize all vehicles at once with OR-Tools, which handles the fleet in parallel"""
+        logger.debug('uses or-tools solver')
+        list_of_locations: List[Location] = []
 
-        # Process each vehicle's assignments independently to ensure single trip
-        optimized_assignments = []
-        
-        # Otherwise, process each vehicle independently
-        for v_idx, locations in enumerate(vehicle_assignments):
-            if not locations:
-                optimized_assignments.append([])
-                continue
+        # Flatten the list of locations
+        for locations in vehicle_assignments:
+            list_of_locations.extend([loc for loc in locations if loc is not None])
 
-            # Create solver for just this vehicle's locations
-            solver: BaseSolver = self.solver_class(
-                vehicles=[self.vehicles[v_idx]],  # Just one vehicle
-                locations=locations,
-                constraints=self.constraints
-            )
+        distance_matrix = None
+        if self._loc_dist_matrix is not None:
+            indices = [self._loc_id_to_idx[loc.id] for loc in list_of_locations]
+            distance_matrix = self._loc_dist_matrix[np.ix_(indices, indices)]
 
-            vehicle_routes = solver.solve()
-            optimized_assignments.append(vehicle_routes[0] if vehicle_routes else [])
-        return optimized_assignments
+        solver = self.solver_class(
+            locations=list_of_locations,
+            vehicles=self.vehicles,
+            constraints=self.constraints,
+            speed_kph=speed_kph,
+            stop_time=stop_time,
+            max_daily_time=self.max_daily_time,
+            distance_matrix=distance_matrix
+        )
+
+        vehicle_routes = solver.solve()
+        if should_print:
+            # Print all locations
+            logger.debug("Optimized locations:")
+            for new_assignments in vehicle_routes:
+                for loc in new_assignments:
+                    if loc is not None:
+                        logger.debug("  - %s (ID: %s)", loc.name, loc.id)
+
+        return vehicle_routes
+
+    def _optimize_per_vehicle(self, vehicle_assignments: List[List[Location]], stop_time: float, speed_kph: float, should_print: bool) -> List[List[Location]]:
+        """Optimize each vehicle's assignments independently to ensure single trip"""
+        return [
+            self._solve_single(v_idx, locations)
+            for v_idx, locations in enumerate(vehicle_assignments)
+        ]
+
+    def _solve_single(self, v_idx: int, locations: List[Location]) -> List[Location]:
+        """Solve the route of a single vehicle"""
+        if not locations:
+            return []
+
+        # Create solver for just this vehicle's locations
+        solver: BaseSolver = self.solver_class(
+            vehicles=[self.vehicles[v_idx]],  # Just one vehicle
+            locations=locations,
+            constraints=self.constraints
+        )
 
+        vehicle_routes = solver.solve()
+        return vehicle_routes[0] if vehicle_routes else []
 
     def process(self, schedule_entries: Iterable[ScheduleEntry], locations: LocationRegistry, speed_kph: float = AVERAGE_SPEED_KPH) -> Tuple[List[RouteAnalysisResult], TripCollection]:
         """Process schedules independently.
@@ -137,46 +215,43 @@ class CVRP:
 
         # Process each schedule independently
         for schedule in schedule_entries:
-            print(f"\nProcessing schedule: {schedule.name} (Frequency: {schedule.frequency} days)")
+            logger.info("Processing schedule: %s (Frequency: %d days)", schedule.name, schedule.frequency)
             
             # Get locations for this schedule
-            schedule_locations = [
-                loc for loc in location_registry.get_all()
-                if loc.disposal_schedule == schedule.frequency
-            ]
+            schedule_locations = location_registry.by_schedule(schedule.frequency)
             
             if not schedule_locations:
-                print(f"No locations found for schedule {schedule.name}")
+                logger.info("No locations found for schedule %s", schedule.name)
                 continue
                 
-            print(f"Found {len(schedule_locations)} locations for {schedule.name}")
+            logger.info("Found %d locations for %s", len(schedule_locations), schedule.name)
             
             # Track processed locations for this schedule
             processed_location_ids = set()
             location_assignments = {}  # Track which day each location is assigned to
             
             day = schedule.frequency
-            remaining_locations = schedule_locations.copy()
+            remaining_locations = {loc.id: loc for loc in schedule_locations}  # location_id -> location
             trip_number = 0
 
             # Process each day's assignments                    
-            print(f"\nProcessing day {day} for {schedule.name}")
-            print(f"Assigned locations for day {day}: {len(schedule_locations)}")
+            logger.debug("Processing day %d for %s", day, schedule.name)
+            logger.debug("Assigned locations for day %d: %d", day, len(schedule_locations))
 
             # Force reassignment if all locations are left
             minimum_force_threshold = 5
 
             while len(remaining_locations) > 0:
-                if len(remaining_locations) <= minimum_force_threshold:
-                    print("Force reassignment of all locations to vehicles:")
-                    for location in remaining_locations:
-                        print(f"  - {location.name} (ID: {location.id})")
+                if len(remaining_locations) <= minimum_force_threshold and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Force reassignment of all locations to vehicles:")
+                    for location in remaining_locations.values():
+                        logger.debug("  - %s (ID: %s)", location.name, location.id)
 
                 # Get vehicle assignments from scheduler
                 initial_assignments = self.collection_scheduler.optimize_vehicle_assignments(
                     vehicles=self.vehicles,
                     day=day,
-                    locations=remaining_locations,
+                    locations=list(remaining_locations.values()),
                     force_assign=len(remaining_locations) <= minimum_force_threshold,
                     use_geo_cluster=True # Skip geo clustering for OR-Tools
                 )
@@ -185,9 +260,10 @@ class CVRP:
                 if total_initial_assignments_len == 0 and len(remaining_locations) > 0:
                     break
 
-                print(f"Initial vehicle assignments for day {day}:")
-                for v_idx, assigned_locations in enumerate(initial_assignments):
-                    print(f"  Vehicle {self.vehicles[v_idx].id}: {len(assigned_locations)} locations")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Initial vehicle assignments for day %d:", day)
+                    for v_idx, assigned_locations in enumerate(initial_assignments):
+                        logger.debug("  Vehicle %s: %d locations", self.vehicles[v_idx].id, len(assigned_locations))
 
                 # Then use solver to optimize the routes
                 vehicle_assignments = self.optimize_routes(
@@ -199,61 +275,55 @@ class CVRP:
                 if vehicle_assignments:
                     trip_number += 1
 
-                unique_assignment_loc_ids = set(loc.id for locs in vehicle_assignments for loc in locs if loc is not None)
-                unique_assignment_loc_len = len(unique_assignment_loc_ids)
+                # Locations the solver dropped from the initial assignments
+                assigned_ids = {loc.id for locs in vehicle_assignments for loc in locs if loc is not None}
+                missing_ids = remaining_locations.keys() - assigned_ids
 
                 # Lazy patching: if the initial assignment = len(remaining_locations)
                 # and vehicle assignments lacks 1 location, then add it to the last vehicle
                 # (Add it the index with the nearest depot location)
-                if total_initial_assignments_len != 0 and len(remaining_locations) == total_initial_assignments_len and total_initial_assignments_len - unique_assignment_loc_len == 1:
-                    print(f"Lazy patching: Adding location to vehicle {self.vehicles[-1].id}")
+                if total_initial_assignments_len != 0 and len(remaining_locations) == total_initial_assignments_len and len(missing_ids) == 1:
+                    logger.debug("Lazy patching: Adding location to vehicle %s", self.vehicles[-1].id)
 
                     # Find the missing location in initial assignments
-                    last_location = None
-
-                    for locs in initial_assignments:
-                        for loc in locs:
-                            if loc is not None and loc.id not in unique_assignment_loc_ids:
-                                last_location = loc
-                                break
+                    last_location = remaining_locations[next(iter(missing_ids))]
 
                     if last_location is not None:
                         # Find the vehicle with the nearest depot location
-                        nearest_vehicle_idx = min(
-                            range(len(self.vehicles)),
-                            key=lambda i: calculate_distance(
-                                self.vehicles[i].depot_location,
-                                last_location.coordinates
-                            )
-                        )
+                        nearest_vehicle_idx = int(np.argmin(
+                            self._dist_depot_loc[:, self._loc_id_to_idx[last_location.id]]
+                        ))
 
-                        # Additional check: if the last location exceeds vehicle capacity
-                        total_wco_before_add = sum(loc.wco_amount for locs in vehicle_assignments for loc in locs if loc is not None)
-                        if total_wco_before_add + last_location.wco_amount > self.vehicles[nearest_vehicle_idx].capacity:
-                            print(f"Warning: Adding location {last_location.str()} exceeds vehicle capacity. Skipping lazy patching.")
+                        # Additional check: if the last location exceeds the nearest vehicle's capacity
+                        vehicle_wco_before_add = sum(
+                            loc.wco_amount for loc in vehicle_assignments[nearest_vehicle_idx] if loc is not None
+                        )
+                        if vehicle_wco_before_add + last_location.wco_amount > self.vehicles[nearest_vehicle_idx].capacity:
+                            logger.warning("Adding location %s exceeds vehicle capacity. Skipping lazy patching.", last_location.str())
                             # Mark the last location as None
                             last_location = None
 
                     if last_location is not None:
-                        print(f"Found missing location for lazy patching: {last_location.str()}")
+                        logger.debug("Found missing location for lazy patching: %s", last_location.str())
 
                         # Find the index to insert with the nearest depot location
-                        insert_index = min(
-                            range(len(vehicle_assignments[nearest_vehicle_idx])),
-                            key=lambda i: calculate_distance(
-                                vehicle_assignments[nearest_vehicle_idx][i].coordinates if vehicle_assignments[nearest_vehicle_idx][i] is not None else self.vehicles[nearest_vehicle_idx].depot_location,
-                                last_location.coordinates
-                            )
-                        )
+                        depot_location = self.vehicles[nearest_vehicle_idx].depot_location
+                        route_coords = [
+                            loc.coordinates if loc is not None else depot_location
+                            for loc in vehicle_assignments[nearest_vehicle_idx]
+                        ]
+                        insert_index = int(np.argmin(
+                            calculate_distance_matrix([last_location.coordinates], route_coords)[0]
+                        ))
 
                         vehicle_assignments[nearest_vehicle_idx].insert(insert_index, last_location)
-                        print(f"Inserting {last_location.str()} at index {insert_index} for vehicle {self.vehicles[nearest_vehicle_idx].id}")
+                        logger.debug("Inserting %s at index %d for vehicle %s", last_location.str(), insert_index, self.vehicles[nearest_vehicle_idx].id)
 
                         # Verify if the location is already assigned
                         if remaining_locations == 0:
-                            print("All locations have been assigned.")
+                            logger.debug("All locations have been assigned.")
                     else:
-                        print("Huh? No missing location found in initial assignments. Skipping lazy patching.")
+                        logger.debug("Huh? No missing location found in initial assignments. Skipping lazy patching.")
 
                 # Register collections
                 for v_idx, assigned_locations in enumerate(vehicle_assignments):
@@ -261,45 +331,34 @@ class CVRP:
                         continue
                         
                     vehicle = self.vehicles[v_idx]
-                    current_load = 0.0
-
-                    for location in assigned_locations:
-                        if location is None:
-                            # Presumed depot start or end
-                            continue
-
-                        # Register collection with tracker
-                        success = collection_tracker.register_collection(
-                            vehicle_id=vehicle.id,
-                            day=day,
-                            trip_number=trip_number,
-                            location=location,
-                            depot_location=vehicle.depot_location,
-                            collection_time_minutes=schedule.collection_time_minutes
-                        )
 
-                        should_collect_load = success
+                    # None entries are presumed depot start or end
+                    stop_locations = [location for location in assigned_locations if location is not None]
 
-                        # if not success and len(assigned_locations) > 1:
-                        #     continue
+                    # Register the vehicle's whole trip with the tracker at once
+                    collection_tracker.register_collection_batch(
+                        vehicle_id=vehicle.id,
+                        day=day,
+                        trip_number=trip_number,
+                        locations=stop_locations,
+                        depot_location=vehicle.depot_location,
+                        collection_time_minutes=schedule.collection_time_minutes
+                    )
 
+                    for location in stop_locations:
                         # Check if the location is already processed
                         location_assignments[location.id] = day
-                        if should_collect_load:
-                            # Update current load
-                            current_load += location.wco_amount
                         # Track processed locations
                         processed_location_ids.add(location.id)
+                        remaining_locations.pop(location.id, None)
 
-                remaining_locations = [loc for loc in remaining_locations if loc.id not in processed_location_ids]
-
-                if remaining_locations and len(remaining_locations) <= 5:
-                    print(f"Remaining locations for day {day}: {len(remaining_locations)}")
-                    for loc in remaining_locations:
-                        print(f"  - {loc.name} (ID: {loc.id})")
+                if remaining_locations and len(remaining_locations) <= 5 and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Remaining locations for day %d: %d", day, len(remaining_locations))
+                    for loc in remaining_locations.values():
+                        logger.debug("  - %s (ID: %s)", loc.name, loc.id)
 
                 if collection_tracker.exceeds_daily_time(day):
-                    print(f"WARNING: Daily time exceeded for day {day}. Clearing the total time.")
+                    logger.warning("Daily time exceeded for day %d. Clearing the total time.", day)
                     collection_tracker.clear_total_time(day)
 
             # Detailed verification of locations
@@ -314,27 +373,27 @@ class CVRP:
                     missing_locations.append(loc)
 
             # Print detailed report
-            print(f"\nLocation Processing Report for {schedule.name}:")
-            print(f"Total locations: {len(schedule_locations)}")
-            print(f"Successfully processed: {len(successful_locations)}")
-            print(f"Missing: {len(missing_locations)}")
+            logger.info("Location Processing Report for %s:", schedule.name)
+            logger.info("Total locations: %d", len(schedule_locations))
+            logger.info("Successfully processed: %d", len(successful_locations))
+            logger.info("Missing: %d", len(missing_locations))
             
-            if successful_locations:
-                print("\nProcessed Locations:")
+            if successful_locations and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Processed Locations:")
                 for loc, day in successful_locations:
-                    print(f"- {loc.name}: Processed on day {day}, WCO: {loc.wco_amount}L")
+                    logger.debug("- %s: Processed on day %s, WCO: %sL", loc.name, day, loc.wco_amount)
             
             if missing_locations:
-                print(f"\nWARNING: {len(missing_locations)} locations were not processed:")
+                logger.warning("%d locations were not processed:", len(missing_locations))
                 total_missed_wco = sum(loc.wco_amount for loc in missing_locations)
-                print("\nMissing locations:")
+                logger.warning("Missing locations:")
                 for loc in missing_locations:
-                    print(f"- {loc.name}: {loc.wco_amount}L WCO, Distance from depot: {loc.distance_from_depot:.2f}km")
-                print(f"\nTotal missed WCO: {total_missed_wco}L ({(total_missed_wco/sum(loc.wco_amount for loc in schedule_locations)*100):.1f}% of schedule total)")
-                print("\nPossible reasons:")
-                print("1. Vehicle capacity constraints")
-                print(f"2. Time budget constraints ({self.max_daily_time/60:.1f}-hour workday)")
-                print("3. Travel time constraints")
+                    logger.warning("- %s: %sL WCO, Distance from depot: %.2fkm", loc.name, loc.wco_amount, loc.distance_from_depot)
+                logger.warning("Total missed WCO: %sL (%.1f%% of schedule total)", total_missed_wco, total_missed_wco/sum(loc.wco_amount for loc in schedule_locations)*100)
+                logger.warning("Possible reasons:")
+                logger.warning("1. Vehicle capacity constraints")
+                logger.warning("2. Time budget constraints (%.1f-hour workday)", self.max_daily_time/60)
+                logger.warning("3. Travel time constraints")
 
             # Generate analysis for all days of this schedule
             schedule_results = self.generate_analysis_data(
@@ -364,20 +423,20 @@ class CVRP:
                 if location_id in visited_locations:
                     visited_locations[location_id]['count'] += 1
                 else:
-                    print(f"Warning: Visit to unknown location ID {location_id}")
+                    logger.warning("Visit to unknown location ID %s", location_id)
         
         # Find missing and duplicate locations
         missing = set()
         duplicates = set()
         
-        print("\nLocation coverage analysis:")
+        logger.info("Location coverage analysis:")
         for loc_id, data in visited_locations.items():
             if data['count'] == 0:
                 missing.add(loc_id)
-                print(f"Missing: {data['name']} (ID: {loc_id}, WCO: {data['wco']}L)")
+                logger.info("Missing: %s (ID: %s, WCO: %sL)", data['name'], loc_id, data['wco'])
             elif data['count'] > 1:
                 duplicates.add(loc_id)
-                print(f"Duplicate: {data['name']} (ID: {loc_id}, visited {data['count']} times)")
+                logger.info("Duplicate: %s (ID: %s, visited %d times)", data['name'], loc_id, data['count'])
         
         return missing, duplicates
     
@@ -396,97 +455,85 @@ class CVRP:
         
         # Generate analysis for each day
         for day in schedule_days:
-            trip_results: List[TripAnalysisResult] = []
-            day_total_distance = 0
-            day_total_collected = 0
-            day_total_collection_time = 0
-            day_total_travel_time = 0
-            day_total_locations = 0
-            day_total_stops = 0
-            day_total_trips = 0
-
             # Group vehicles by trip number
             trip_vehicles: Dict[int, List[VehicleRouteInfo]] = {}
 
-            # Initialize trip_vehicles            
-            for vehicle_idx, vehicle in enumerate(self.vehicles):
-                print(f"\nProcessing vehicle {vehicle.id} for day {day}")
+            for vehicle in self.vehicles:
+                logger.debug("Processing vehicle %s for day %d", vehicle.id, day)
                 route = collection_tracker.get_vehicle_route(vehicle.id, day)
                 if not route.stops:
                     continue
 
-                print(f"There are {len(route.stops)} stops for vehicle {vehicle.id} on day {day}")
-                for stop in route.stops:
-                    trip_num = stop.trip_number
-                    if trip_num not in trip_vehicles:
-                        trip_vehicles[trip_num] = []
-
-                for trip_num in trip_vehicles.keys():
-                    # Process vehicle route info as before
-                    vehicle_route = self._process_vehicle_route(vehicle, route, day, trip_num, locations)
-                    
-                    if 0 <= vehicle_idx < len(trip_vehicles[trip_num]):
-                        trip_vehicles[trip_num][vehicle_idx] = vehicle_routes
-                    else:
-                        trip_vehicles[trip_num].append(vehicle_route)
-
-            # Create TripAnalysisResult for each trip
-            for trip_num, vehicle_routes in trip_vehicles.items():
-                trip_result = TripAnalysisResult(
-                    collection_day=trip_num,
-                    total_locations=sum(len(vr.stops) for vr in vehicle_routes),
-                    total_vehicles=len(vehicle_routes),
-                    total_distance=sum(vr.total_distance for vr in vehicle_routes),
-                    total_collected=sum(vr.total_collected for vr in vehicle_routes),
-                    total_collection_time=sum(vr.total_collection_time for vr in vehicle_routes),
-                    total_travel_time=sum(vr.total_travel_time for vr in vehicle_routes),
-                    total_stops=sum(vr.total_stops for vr in vehicle_routes),
-                    vehicle_routes=vehicle_routes
-                )
-                trip_results.append(trip_result)
-
-            day_total_distance = sum(trip.total_distance for trip in trip_results)
-            day_total_collected = sum(trip.total_collected for trip in trip_results)
-            day_total_collection_time = sum(trip.total_collection_time for trip in trip_results)
-            day_total_travel_time = sum(trip.total_travel_time for trip in trip_results)
-            day_total_locations = sum(trip.total_locations for trip in trip_results)
-            day_total_stops = sum(trip.total_stops for trip in trip_results)
-            day_total_trips = len(trip_results)
+                logger.debug("There are %d stops for vehicle %s on day %d", len(route.stops), vehicle.id, day)
 
-            # Create RouteAnalysisResult for the day
+                # Bucket the stops by trip once so each trip only walks its own stops
+                stops_by_trip: Dict[int, List[CollectionStop]] = {}
+                trip_start_index: Dict[int, int] = {}  # Position of each trip's first stop in the route
+                for i, stop in enumerate(route.stops):
+                    trip_num = stop.trip_number
+                    if trip_num not in stops_by_trip:
+                        stops_by_trip[trip_num] = []
+                        trip_start_index[trip_num] = i
+                    stops_by_trip[trip_num].append(stop)
+
+                # Build the route info once for each trip this vehicle actually made
+                for trip_num, trip_stops in stops_by_trip.items():
+                    vehicle_route = self._process_vehicle_route(
+                        vehicle, route, day,
+                        trip_stops,
+                        trip_start_index[trip_num],
+                        locations
+                    )
+                    trip_vehicles.setdefault(trip_num, []).append(vehicle_route)
+
+            # Create RouteAnalysisResult for the day; trips add themselves to its totals
             day_result = RouteAnalysisResult(
                 schedule_id=f"{schedule_id}_day{day}",
                 schedule_name=f"{schedule_name} (Day {day})",
                 date_generated=datetime.now(),
-                total_locations=day_total_locations,
+                total_locations=0,
                 total_vehicles=len(self.vehicles),
-                total_distance=day_total_distance,
-                total_collected=day_total_collected,
-                total_collection_time=day_total_collection_time,
-                total_travel_time=day_total_travel_time,
-                total_trips=day_total_trips,
-                total_stops=day_total_stops,
+                total_distance=0.0,
+                total_collected=0.0,
+                total_trips=0,
+                total_stops=0,
                 collection_day=day,
-                trips=trip_results,
+                trips=[],
                 base_schedule_id=schedule_id,
                 base_schedule_day=base_day
             )
 
+            # Create TripAnalysisResult for each trip
+            for trip_num, vehicle_routes in trip_vehicles.items():
+                trip_result = TripAnalysisResult(
+                    collection_day=trip_num,
+                    total_locations=sum(len(v.stops) for v in vehicle_routes),
+                    total_vehicles=len(vehicle_routes),
+                    total_distance=sum(v.total_distance for v in vehicle_routes),
+                    total_collected=sum(v.total_collected for v in vehicle_routes),
+                    total_collection_time=sum(v.total_collection_time for v in vehicle_routes),
+                    total_travel_time=sum(v.total_travel_time for v in vehicle_routes),
+                    total_stops=sum(v.total_stops for v in vehicle_routes),
+                    vehicle_routes=vehicle_routes
+                )
+                day_result.add_trip(trip_result)
+
             results.append(day_result)
 
         return results
 
-    def _process_vehicle_route(self, vehicle: Vehicle, route: VehicleRoute, day: int, trip_number: int, locations: LocationRegistry) -> VehicleRouteInfo:
-        """Helper method to process vehicle route info."""
+    def _process_vehicle_route(self, vehicle: Vehicle, route: VehicleRoute, day: int, trip_stops: List[CollectionStop], sequence_start: int, locations: LocationRegistry) -> VehicleRouteInfo:
+        """Helper method to process vehicle route info for the stops of a single trip.
+
+        trip_stops are the trip's stops in visiting order and sequence_start is the
+        position of the first of them within the vehicle's route for the day.
+        """
         stops_data: list[StopInfo] = []
-        should_add_depot_start = True
+        last_index = sequence_start + len(trip_stops) - 1
 
         # Process regular stops
-        for i, stop in enumerate(route.stops):
-            if stop.trip_number != trip_number:
-                continue
-
-            if should_add_depot_start:
+        for i, stop in enumerate(trip_stops, start=sequence_start):
+            if i == sequence_start:
                 # Add depot start stop for each trip
                 depot_start = StopInfo(
                     name="Depot",
@@ -505,7 +552,6 @@ class CVRP:
                     travel_time=0
                 )
                 stops_data.append(depot_start)
-                should_add_depot_start = False
 
             location_data = locations.get_by_id(stop.location_id)
             remaining_capacity = vehicle.capacity - stop.cumulative_load
@@ -529,10 +575,10 @@ class CVRP:
 
             stops_data.append(stop_info)
 
-            if (i + 1 < len(route.stops) and stop.trip_number != route.stops[i + 1].trip_number) or i == len(route.stops) - 1:
+            if i == last_index:
                 depot_end_distance = calculate_distance(stop.coordinates, vehicle.depot_location)
 
-                # Add depot end stop between trips
+                # Add depot end stop after the trip's last stop
                 depot_end = StopInfo(
                     name="Depot",
                     location_id=f"depot_end_{vehicle.id}_trip_{stop.trip_number}",
@@ -551,13 +597,17 @@ class CVRP:
                 )
 
                 stops_data.append(depot_end)
-                should_add_depot_start = True
 
-        vehicle_collected = sum(stop.wco_amount for stop in stops_data)
-        vehicle_collection_time = sum(stop.collection_time for stop in stops_data)
-        vehicle_travel_time = sum(stop.travel_time for stop in stops_data)
+        vehicle_collected = 0
+        vehicle_collection_time = 0
+        vehicle_travel_time = 0
         total_stops = len(stops_data)
-        total_distance = sum(stop.distance_from_prev for stop in stops_data)
+        total_distance = 0
+        for stop in stops_data:
+            vehicle_collected += stop.wco_amount
+            vehicle_collection_time += stop.collection_time
+            vehicle_travel_time += stop.travel_time
+            total_distance += stop.distance_from_prev
 
         vehicle_route = VehicleRouteInfo(
             vehicle_id=vehicle.id,
@@ -569,7 +619,6 @@ class CVRP:
             efficiency=vehicle_collected / vehicle.capacity if vehicle.capacity > 0 else 0,
             stops=stops_data,
             collection_day=day,  # Add collection day
-            road_paths=[],  # Road paths will be added later by the visualizer
             total_collection_time=vehicle_collection_time,
             total_travel_time=vehicle_travel_time,
         )
@@ -579,33 +628,32 @@ class CVRP:
     def print_daily_summaries(self, collection_tracker: TripCollection):
         """Print summaries of daily routes and vehicle utilization"""
         print("\nDaily Route Summaries:")
+
         days = sorted(set(day for _, day, _ in collection_tracker.vehicle_collections.keys()))
         
         for day in days:
             print(f"\nDay {day} Summary:")
             for vehicle in self.vehicles:
                 # Get collections just for this day
-                day_collections = [
-                    collection for key, collection 
-                    in collection_tracker.vehicle_collections.items()
-                    if key[0] == vehicle.id and key[1] == day
-                ]
+                day_collections = collection_tracker.get_collections(vehicle.id, day)
                 
                 if day_collections:  # Only print if vehicle was used this day
-                    # Group stops by trip number
+                    # Group stops by trip number, taking each trip's load from its running total
                     trips_data = {}
+                    trips_collected = {}
                     for collection in day_collections:
                         if collection.trip_number not in trips_data:
                             trips_data[collection.trip_number] = []
+                            trips_collected[collection.trip_number] = 0.0
                         trips_data[collection.trip_number].extend(collection.stops)
+                        trips_collected[collection.trip_number] += collection.total_collected
                     
                     total_stops = sum(len(c.stops) for c in day_collections)
                     total_trips = len(trips_data)
                     
                     # Calculate utilization per trip
                     trip_utilizations = []
-                    for trip_num, stops in sorted(trips_data.items()):
-                        trip_collected = sum(stop.amount_collected for stop in stops)
+                    for trip_num, trip_collected in sorted(trips_collected.items()):
                         trip_utilization = trip_collected / vehicle.capacity
                         trip_utilizations.append(f"{trip_utilization:.1%}")
                     
@@ -616,15 +664,16 @@ class CVRP:
                     
                     # Alert if any trip exceeds capacity
                     for trip_num, stops in trips_data.items():
-                        trip_collected = sum(stop.amount_collected for stop in stops)
+                        trip_collected = trips_collected[trip_num]
                         if trip_collected > vehicle.capacity:
                             print(f"    WARNING: Trip {trip_num} exceeds vehicle capacity "
                                   f"({trip_collected:.1f}L > {vehicle.capacity:.1f}L)")
                             
-                            # List stops in this overloaded trip
-                            print("    Stops in overloaded trip:")
-                            cumulative_load = 0
-                            for stop in stops:
-                                cumulative_load += stop.amount_collected
-                                print(f"      - {stop.location_name}: {stop.amount_collected:.1f}L "
-                                      f"(Cumulative: {cumulative_load:.1f}L)")
\ No newline at end of file
+                            # List stops in this overloaded trip, written out in one go
+                            lines = ["    Stops in overloaded trip:"]
+                            lines.extend(
+                                f"      - {stop.location_name}: {stop.amount_collected:.1f}L "
+                                f"(Cumulative: {cumulative_load:.1f}L)"
+                                for stop, cumulative_load in zip(stops, accumulate(stop.amount_collected for stop in stops))
+                            )
+                            sys.stdout.write('\n'.join(lines) + '\n')
\ No newline at end of file
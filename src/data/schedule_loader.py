@@ -1,35 +1,144 @@
 from pathlib import Path
+from typing import List, Tuple
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from models.location import Location
 from models.shared_models import ScheduleEntry
 from models.location_registry import LocationRegistry
-from uuid import uuid4
+from collections import Counter
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+logger = logging.getLogger(__name__)
+
+# Parsed columns are cached as JSON outside the data directory; set CVRP_CACHE_DIR to move it
+CACHE_DIR = Path(os.getenv('CVRP_CACHE_DIR', Path.home() / '.cache' / 'cvrp'))
+
+LOCATION_COLUMNS = ('id', 'name', 'latitude', 'longitude', 'wco_amount', 'disposal_schedule')
+
+# The schedule CSV schema is fixed, so skip type inference.
+# Coordinates stay float64: they are matched exactly against configured one-way roads.
+CSV_DTYPES = {
+    'id': 'object',
+    'name': 'object',
+    'latitude': 'float64',
+    'longitude': 'float64',
+    'wco_amount': 'float64',
+    'disposal_schedule': 'int64',
+}
 
 class ScheduleLoader:
+    @staticmethod
+    def _read_columns(data_path: Path) -> Tuple[List, ...]:
+        """Read the location columns of a schedule CSV as Python lists.
+
+        Set CVRP_FAST_IO=1 to parse with pyarrow when it is installed.
+        """
+        if pacsv is not None and os.getenv('CVRP_FAST_IO') == '1':
+            convert_options = pacsv.ConvertOptions(
+                column_types={column: pa.type_for_alias('string' if dtype == 'object' else dtype)
+                              for column, dtype in CSV_DTYPES.items()},
+                include_columns=list(LOCATION_COLUMNS)
+            )
+            table = pacsv.read_csv(str(data_path), convert_options=convert_options)
+            return tuple(table.column(column).to_pylist() for column in LOCATION_COLUMNS)
+
+        df = pd.read_csv(data_path, dtype=CSV_DTYPES, usecols=list(LOCATION_COLUMNS), engine='c')
+        return tuple(df[column].tolist() for column in LOCATION_COLUMNS)
+
+    @staticmethod
+    def _read_cached_columns(data_path: Path) -> Tuple[List, ...]:
+        """Read the location columns, reusing the cached copy while the CSV is unchanged"""
+        stat = data_path.stat()
+        # The column layout is part of the key so a schema change never reuses an old cache
+        key = [stat.st_mtime_ns, stat.st_size, list(LOCATION_COLUMNS)]
+        digest = hashlib.sha256(str(data_path.resolve()).encode()).hexdigest()
+        cache_path = CACHE_DIR / f"schedule_{digest}.json"
+
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            columns = cached['columns']
+            if (cached['key'] == key and len(columns) == len(LOCATION_COLUMNS)
+                    and all(isinstance(column, list) for column in columns)):
+                return tuple(columns)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Ignoring unreadable schedule cache %s: %s", cache_path, e)
+
+        columns = ScheduleLoader._read_columns(data_path)
+        # Write to a temporary file first so concurrent loads never see a partial cache
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'columns': list(columns)}, f)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Could not write schedule cache %s: %s", cache_path, e)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        return columns
+
     @staticmethod
     def load_schedule_data(schedule_entry: ScheduleEntry, base_path: Path) -> LocationRegistry:
         """Load location data from schedule-specific CSV file."""
         data_path = base_path / schedule_entry.file
-        df = pd.read_csv(data_path)
-        
+
+        # Pull whole columns as Python lists instead of boxing every row into a Series
+        ids, names, latitudes, longitudes, wco_amounts, schedules = ScheduleLoader._read_cached_columns(data_path)
+
+        # IDs come from the CSV's id column, scoped by file, so they survive edits to other rows.
+        # The registry skips repeated IDs, so reject duplicates here instead of losing locations.
+        location_ids = [f"{schedule_entry.file}:{str(location_id).strip()}" for location_id in ids]
+        duplicates = sorted(location_id for location_id, count in Counter(location_ids).items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Duplicate location IDs in {data_path}: {', '.join(duplicates)}")
+
+        # The columns are already typed by the CSV schema, so the Location dataclass is built directly.
         registry = LocationRegistry()
-        for _, row in df.iterrows():
-            location = Location(
-                id=f"loc_{uuid4().hex[:8]}",
-                name=row['name'],
-                coordinates=(row['latitude'], row['longitude']),
-                wco_amount=row['wco_amount'],
-                disposal_schedule=row['disposal_schedule']
+        registry.add_many(
+            Location(
+                id=location_id,
+                name=str(name),
+                coordinates=(float(latitude), float(longitude)),
+                wco_amount=float(wco_amount),
+                disposal_schedule=int(schedule)
             )
-            registry.add(location)
+            for location_id, name, latitude, longitude, wco_amount, schedule
+            in zip(location_ids, names, latitudes, longitudes, wco_amounts, schedules)
+        )
         
         return registry
 
     @classmethod
     def load_all_schedules(cls, schedule_entries, base_path: Path) -> LocationRegistry:
         """Load and combine location data from multiple schedules"""
+        schedule_entries = list(schedule_entries)
         combined_registry = LocationRegistry()
-        for schedule in schedule_entries:
-            registry = cls.load_schedule_data(schedule, base_path)
-            combined_registry = combined_registry + registry
+        if not schedule_entries:
+            return combined_registry
+
+        # Each file is independent and the CSV parsers release the GIL, so read them concurrently
+        with ThreadPoolExecutor(max_workers=min(8, len(schedule_entries))) as executor:
+            registries = list(executor.map(
+                lambda schedule: cls.load_schedule_data(schedule, base_path),
+                schedule_entries
+            ))
+
+        # Merge in schedule order so the combined registry is the same as a serial load
+        for registry in registries:
+            combined_registry.add_many(registry)
         return combined_registry
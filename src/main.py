@@ -18,36 +18,71 @@ Programmer's Task:
 """
 
 import traceback
-import pandas as pd
+import logging
 import os
 from pathlib import Path
 from models.location import Location, Vehicle
-from visualization.route_visualizer import RouteVisualizer
-from typing import List
+from typing import List, Dict, Callable, Any
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import argparse
 from models.config import Config
-from models.shared_models import ScheduleEntry
 from datetime import datetime
+from dataclasses import is_dataclass, asdict
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from models.route_data import RouteAnalysisResult
 from models.trip_collection import TripCollection
-from models.location_registry import LocationRegistry
 from cvrp import CVRP
 from data.schedule_loader import ScheduleLoader
-from api.server import start_api_server
 from solvers.solvers import SOLVERS, DEFAULT_SOLVER_ID
 
+def _public_asdict(obj) -> dict:
+    """asdict() without underscore-prefixed (internal) fields, matching what orjson emits"""
+    return asdict(obj, dict_factory=lambda items: {k: v for k, v in items if not k.startswith('_')})
+
 class DateTimeEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle datetime objects and custom classes"""
+    # Serializer chosen for each type, so nested objects of a known type skip the checks
+    _type_cache: Dict[type, Callable[[Any], Any]] = {}
+
     def default(self, obj):
+        serializer = self._type_cache.get(type(obj))
+        if serializer is None:
+            serializer = self._type_cache[type(obj)] = self._serializer_for(obj)
+        return serializer(obj)
+
+    @staticmethod
+    def _serializer_for(obj) -> Callable[[Any], Any]:
         if isinstance(obj, datetime):
-            return obj.isoformat()
+            return datetime.isoformat
+        if is_dataclass(obj):
+            # Converts the whole dataclass tree in one call instead of once per nested object
+            return _public_asdict
         if hasattr(obj, '__dict__'):
-            return obj.__dict__
-        try:
-            return json.JSONEncoder.default(self, obj)
-        except TypeError:
-            return str(obj)  # Last resort: convert to string
+            return vars
+        return str  # Last resort: convert to string
+
+JSON_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+def dump_json(obj, path: Path) -> None:
+    """Write obj as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        data = orjson.dumps(
+            obj,
+            default=DateTimeEncoder().default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+        with open(path, 'wb') as f:
+            f.write(data)
+        return
+
+    # json.dump emits many small chunks, so buffer them into a few large writes
+    with open(path, 'w', buffering=JSON_WRITE_BUFFER_SIZE) as f:
+        json.dump(obj, f, indent=2, cls=DateTimeEncoder)
 
 class CvrpSystem:
     def __init__(self):
@@ -95,38 +130,20 @@ class CvrpSystem:
         return parser.parse_args()
 
     def load_config(self) -> Config:
-        config_path = Path(__file__).parent.parent / 'data' / 'schedule_config.json'
+        config_path = self.data_path / 'schedule_config.json'
         with open(config_path) as f:
             config_dict = json.load(f)
         return Config(**config_dict)
     
-    def load_schedule_data(self, schedule_entry: ScheduleEntry) -> LocationRegistry:
-        """Load location data from schedule-specific CSV file."""
-        data_path = Path(__file__).parent.parent / 'data' / schedule_entry.file
-        df = pd.read_csv(data_path)
-        
-        registry = LocationRegistry()
-        for _, row in df.iterrows():
-            location = Location(
-                name=row['name'],
-                coordinates=(row['latitude'], row['longitude']),
-                wco_amount=row['wco_amount'],
-                disposal_schedule=row['disposal_schedule']
-            )
-
-            registry.add(location)
-        
-        return registry
-
     def save_analysis_results(self, config: Config, cvrp: CVRP, results: List[RouteAnalysisResult], collection_tracker: TripCollection):
         """Save analysis results to files, organizing by schedule and day."""
+        # Imported here so that runs which never save results skip loading folium and ORS
+        from visualization.route_visualizer import RouteVisualizer
+
         # Group results by base schedule
-        schedule_groups: dict[str, list[RouteAnalysisResult]] = {}
+        schedule_groups: dict[str, list[RouteAnalysisResult]] = defaultdict(list)
         for analysis in results:
-            base_id = analysis.base_schedule_id
-            if base_id not in schedule_groups:
-                schedule_groups[base_id] = []
-            schedule_groups[base_id].append(analysis)
+            schedule_groups[analysis.base_schedule_id].append(analysis)
 
         output_path = self.create_output_directory()
         
@@ -138,34 +155,58 @@ class CvrpSystem:
             
             print(f"\nProcessing results for schedule {base_id}:")
             
-            # Save each day's results
-            for analysis in sorted(schedule_results, key=lambda x: x.collection_day):
-                day = analysis.collection_day
-                print(f"  Saving day {day} results...")
-                
-                # Create visualization
-                visualizer = RouteVisualizer(
-                    center_coordinates=config.map.center,
-                    api_key=self.api_key
-                )
-                visualizer.add_routes(analysis)
-                
-                # Save visualization and data
-                visualizer.save(schedule_dir / f"routes_day{day}.html", analysis)
-                with open(schedule_dir / f"analysis_day{day}.json", 'w') as f:
-                    json.dump(analysis, f, indent=2, cls=DateTimeEncoder)
+            # One visualizer per schedule, so road paths fetched for one day are reused on the next
+            visualizer = RouteVisualizer(
+                center_coordinates=config.map.center,
+                api_key=self.api_key
+            )
+
+            # Save each day's results. The JSON dumps run in the background while the
+            # visualizer (kept on this thread) fetches road paths for the next day.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                json_writes = []
+                for analysis in sorted(schedule_results, key=lambda x: x.collection_day):
+                    day = analysis.collection_day
+                    print(f"  Saving day {day} results...")
+
+                    # A day without stops has no routes to draw, so only save its data
+                    if analysis.total_locations == 0 or not analysis.vehicle_routes:
+                        json_writes.append(executor.submit(dump_json, analysis, schedule_dir / f"analysis_day{day}.json"))
+                        continue
+                    
+                    # Create visualization
+                    visualizer.clear_routes()
+                    visualizer.add_routes(analysis)
+                    
+                    # Save data once add_routes has filled in the trip paths, then the visualization
+                    json_writes.append(executor.submit(dump_json, analysis, schedule_dir / f"analysis_day{day}.json"))
+                    visualizer.save(schedule_dir / f"routes_day{day}.html", analysis)
+
+                # Surface any error raised while writing
+                for json_write in json_writes:
+                    json_write.result()
 
             # Create schedule summary
+            days = []
+            total_locations = 0
+            total_distance = 0
+            total_collected = 0
+            for day_result in schedule_results:
+                days.append(day_result.collection_day)
+                total_locations += day_result.total_locations
+                total_distance += day_result.total_distance
+                total_collected += day_result.total_collected
+
             summary = {
                 'schedule_id': base_id,
                 'total_days': len(schedule_results),
-                'days': [day.collection_day for day in schedule_results],
-                'total_locations': sum(day.total_locations for day in schedule_results),
-                'total_distance': sum(day.total_distance for day in schedule_results),
-                'total_collected': sum(day.total_collected for day in schedule_results)
+                'days': days,
+                'total_locations': total_locations,
+                'total_distance': total_distance,
+                'total_collected': total_collected
             }
             
-            with open(schedule_dir / 'schedule_summary.json', 'w') as f:
+            with open(schedule_dir / 'schedule_summary.json', 'w', buffering=JSON_WRITE_BUFFER_SIZE) as f:
                 json.dump(summary, f, indent=2)
             
             print(f"  Summary: {len(schedule_results)} days, {summary['total_locations']} locations")
@@ -178,6 +219,7 @@ class CvrpSystem:
         args = self.parse_args()
         
         if args.api:
+            from api.server import start_api_server
             print(f"Starting API server on port {args.port}...")
             start_api_server(port=args.port)
             return
@@ -229,6 +271,7 @@ class CvrpSystem:
             traceback.print_exc()
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     system = CvrpSystem()
     system.run()
 
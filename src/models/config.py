@@ -1,4 +1,7 @@
 from pydantic import BaseModel, Field
+from functools import lru_cache
+from pathlib import Path
+import json
 from typing import List, Tuple, Optional
 from utils import MAX_DAILY_TIME
 from solvers.solvers import DEFAULT_SOLVER_ID
@@ -30,4 +33,15 @@ class Config(BaseModel):
     map: MapConfig
     schedules: List[SharedScheduleEntry] = Field(default_factory=list)
     locations: List[Location] = Field(default_factory=list)
-    settings: SolveConfig
\ No newline at end of file
+    settings: SolveConfig
+
+@lru_cache(maxsize=4)
+def _load_config_cached(config_path: str, mtime_ns: int) -> Config:
+    """Parse a config file; the mtime is part of the cache key so edits are picked up"""
+    with open(config_path) as f:
+        config_dict = json.load(f)
+    return Config(**config_dict)
+
+def load_config_file(config_path: Path) -> Config:
+    """Load a config file as a private copy of the Config cached while the file is unchanged"""
+    return _load_config_cached(str(config_path), config_path.stat().st_mtime_ns).copy(deep=True)
@@ -1,6 +1,9 @@
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Set, Iterable, Sequence
 from collections import defaultdict
 from models.location import Location
+import numpy as np
+
+INITIAL_COORDINATE_CAPACITY = 64
 
 class LocationRegistry:
     """Efficient data structure for storing and retrieving locations with array-based indexing"""
@@ -8,102 +11,217 @@ class LocationRegistry:
     def __init__(self, items: List[Location] = None):
         self._all_locations: List[Location] = []
         self._location_ids: List[str] = []  # Change to string IDs
+        self._id_to_index: Dict[str, int] = {}  # location ID -> position in the arrays
         self._coordinates_map: Dict[Tuple[float, float], List[str]] = defaultdict(list)  # coordinates -> list of location IDs
         self._location_names: List[str] = []
-        self._name_indices: Dict[str, List[int]] = defaultdict(list)
+        self._name_to_single: Dict[str, int] = {}  # name -> index, for names used by one location
+        self._name_to_many: Dict[str, List[int]] = {}  # name -> indices, for names shared by several locations
+        self._schedule_locations: Dict[int, List[Location]] = defaultdict(list)  # disposal schedule -> locations
+        self._kdtree = None  # Spatial index over _coordinates_map keys, built on the first tolerance query
+        self._kdtree_coords: List[Tuple[float, float]] = []
+        self._coord_array = np.empty((INITIAL_COORDINATE_CAPACITY, 2), dtype=np.float64)  # Packed coordinates, row i is location i
 
         if items:
-            for item in items:
-                self.add(item)
+            self.add_many(items)
 
     def add(self, location: Location) -> None:
         """Add a location to all indices"""
-        if location.id in self._location_ids:
+        if location.id in self._id_to_index:
             return
 
         index = len(self._all_locations)
+        self._kdtree = None
+        self._id_to_index[location.id] = index
         self._all_locations.append(location)
         self._location_ids.append(location.id)
         self._coordinates_map[location.coordinates].append(location.id)
         self._location_names.append(location.name)
-        self._name_indices[location.name].append(index)
+        self._index_name(location.name, index)
+        self._schedule_locations[location.disposal_schedule].append(location)
+        self._reserve_coordinates(index + 1)
+        self._coord_array[index] = location.coordinates
+
+    def add_many(self, locations: Iterable[Location]) -> None:
+        """Add several locations to all indices at once"""
+        self._kdtree = None
+
+        # Bind the containers and their appends once for the whole batch
+        all_locations = self._all_locations
+        id_to_index = self._id_to_index
+        append_location = all_locations.append
+        append_id = self._location_ids.append
+        append_name = self._location_names.append
+        coordinates_map = self._coordinates_map
+        name_to_single = self._name_to_single
+        name_to_many = self._name_to_many
+        schedule_locations = self._schedule_locations
+        coord_array = self._coord_array
+
+        for location in locations:
+            location_id = location.id
+            if location_id in id_to_index:
+                continue
+
+            index = len(all_locations)
+            id_to_index[location_id] = index
+            name = location.name
+            if name in name_to_many:
+                name_to_many[name].append(index)
+            elif name in name_to_single:
+                name_to_many[name] = [name_to_single.pop(name), index]
+            else:
+                name_to_single[name] = index
+            append_location(location)
+            append_id(location_id)
+            coordinates_map[location.coordinates].append(location_id)
+            append_name(location.name)
+            schedule_locations[location.disposal_schedule].append(location)
+            if index >= len(coord_array):
+                self._reserve_coordinates(index + 1)
+                coord_array = self._coord_array
+            coord_array[index] = location.coordinates
+
+    def _index_name(self, name: str, index: int) -> None:
+        """Record that the location at index has the given name"""
+        if name in self._name_to_many:
+            self._name_to_many[name].append(index)
+        elif name in self._name_to_single:
+            self._name_to_many[name] = [self._name_to_single.pop(name), index]
+        else:
+            self._name_to_single[name] = index
+
+    def _reserve_coordinates(self, count: int) -> None:
+        """Grow the packed coordinate array by doubling until it holds count rows"""
+        capacity = len(self._coord_array)
+        if count <= capacity:
+            return
+
+        while capacity < count:
+            capacity *= 2
+        grown = np.empty((capacity, 2), dtype=np.float64)
+        grown[:len(self._coord_array)] = self._coord_array
+        self._coord_array = grown
 
     def __add__(self, other: 'LocationRegistry') -> 'LocationRegistry':
         """Combine two location registries"""
 
-        for location in other._all_locations:
-            self.add(location)
-
+        self.add_many(other._all_locations)
         return self
             
     def remove(self, location: Location) -> None:
         """Remove a location from all indices"""
-        try:
-            index = self._location_ids.index(location.id)
-        except ValueError:
+        index = self._id_to_index.pop(location.id, None)
+        if index is None:
             return
-            
-        # Remove from all arrays
-        self._all_locations.pop(index)
-        self._location_ids.pop(index)
-        self._location_names.pop(index)
-        name = self._location_names.pop(index)
+
+        self._kdtree = None
+        removed = self._all_locations[index]
+        name = self._location_names[index]
+        self._schedule_locations[removed.disposal_schedule].remove(removed)
+        if not self._schedule_locations[removed.disposal_schedule]:
+            del self._schedule_locations[removed.disposal_schedule]
+
+        # Update coordinate index
+        self._coordinates_map[removed.coordinates].remove(removed.id)
+        if not self._coordinates_map[removed.coordinates]:
+            del self._coordinates_map[removed.coordinates]
         
-        # Update name indices
-        self._name_indices[name].remove(index)
-        if not self._name_indices[name]:
-            del self._name_indices[name]
-            
-        # Update remaining indices
-        self._update_indices(index)
-            
-    def _update_indices(self, removed_index: int) -> None:
-        """Update indices after removal"""
-        # Update name indices - shift all indices greater than removed_index
-        for indices in self._name_indices.values():
-            indices[:] = [idx - 1 if idx > removed_index else idx for idx in indices]
-            indices.sort()  # Keep indices ordered
+        # Update name indices, going back to the single-index map when one location is left
+        if self._name_to_single.get(name) == index:
+            del self._name_to_single[name]
+        else:
+            indices = self._name_to_many[name]
+            indices.remove(index)
+            if len(indices) == 1:
+                self._name_to_single[name] = indices[0]
+                del self._name_to_many[name]
+
+        # Move the last location into the freed slot instead of shifting everything after it
+        last_index = len(self._all_locations) - 1
+        if index != last_index:
+            moved = self._all_locations[last_index]
+            self._all_locations[index] = moved
+            self._location_ids[index] = self._location_ids[last_index]
+            self._location_names[index] = self._location_names[last_index]
+            self._coord_array[index] = self._coord_array[last_index]
+            self._id_to_index[moved.id] = index
+            moved_name = self._location_names[last_index]
+            if self._name_to_single.get(moved_name) == last_index:
+                self._name_to_single[moved_name] = index
+            else:
+                moved_indices = self._name_to_many[moved_name]
+                moved_indices[moved_indices.index(last_index)] = index
+
+        self._all_locations.pop()
+        self._location_ids.pop()
+        self._location_names.pop()
             
     def get_by_id(self, location_id: str) -> Optional[Location]:
         """Get location by ID"""
-        try:
-            index = self._location_ids.index(location_id)
-            return self._all_locations[index]
-        except ValueError:
-            return None
+        index = self._id_to_index.get(location_id)
+        return self._all_locations[index] if index is not None else None
     
     def get_by_name(self, name: str) -> Set[Location]:
         """Get all locations with the given name"""
-        indices = self._name_indices.get(name, [])
-        return {self._all_locations[i] for i in indices}
+        index = self._name_to_single.get(name)
+        if index is not None:
+            return {self._all_locations[index]}
+        return {self._all_locations[i] for i in self._name_to_many.get(name, ())}
     
     def get_by_coordinates(self, coordinates: Tuple[float, float], tolerance: float = 1e-6) -> List[Location]:
         """Get all locations at given coordinates"""
         # Exact match first
         if coordinates in self._coordinates_map:
-            return [self._all_locations[self._location_ids.index(loc_id)] 
+            return [self._all_locations[self._id_to_index[loc_id]] 
                    for loc_id in self._coordinates_map[coordinates]]
 
-        # Try with tolerance
+        if not self._coordinates_map:
+            return []
+
+        # Try with tolerance, narrowing the candidates with a KD-tree instead of scanning every coordinate
+        if self._kdtree is None:
+            from scipy.spatial import cKDTree
+            self._kdtree_coords = list(self._coordinates_map.keys())
+            self._kdtree = cKDTree(self._kdtree_coords)
+
         matches = []
-        for coord, loc_ids in self._coordinates_map.items():
+        for i in sorted(self._kdtree.query_ball_point(coordinates, r=tolerance, p=float('inf'))):
+            coord = self._kdtree_coords[i]
             if (abs(coord[0] - coordinates[0]) < tolerance and 
                 abs(coord[1] - coordinates[1]) < tolerance):
-                matches.extend([self._all_locations[self._location_ids.index(loc_id)] 
-                              for loc_id in loc_ids])
+                matches.extend([self._all_locations[self._id_to_index[loc_id]] 
+                              for loc_id in self._coordinates_map[coord]])
         return matches
     
-    def get_all(self) -> List[Location]:
-        """Get all locations"""
+    def get_all(self) -> Sequence[Location]:
+        """Get all locations, without copying. Callers that need to modify the result should use get_all_copy()"""
+        return self._all_locations
+
+    def get_all_copy(self) -> List[Location]:
+        """Get a copy of the list of all locations"""
         return self._all_locations.copy()
+
+    def coordinates_array(self) -> np.ndarray:
+        """Get a read-only (N, 2) view of all coordinates, in the same order as get_all()"""
+        view = self._coord_array[:len(self._all_locations)]
+        view.flags.writeable = False
+        return view
+
+    def by_schedule(self, frequency: int) -> List[Location]:
+        """Get all locations with the given disposal schedule"""
+        return self._schedule_locations.get(frequency, []).copy()
     
     def clear(self) -> None:
         """Clear all locations"""
         self._location_ids.clear()
+        self._id_to_index.clear()
         self._coordinates_map.clear()
         self._location_names.clear()
-        self._name_indices.clear()
+        self._name_to_single.clear()
+        self._name_to_many.clear()
+        self._schedule_locations.clear()
         self._all_locations.clear()
+        self._kdtree = None
         
     def __len__(self) -> int:
         return len(self._all_locations)
@@ -113,9 +231,9 @@ class LocationRegistry:
     
     def __contains__(self, item) -> bool:
         if isinstance(item, Location):
-            return item.id in self._location_ids
+            return item.id in self._id_to_index
         elif isinstance(item, str):
-            return item in self._location_ids
+            return item in self._id_to_index
         elif isinstance(item, tuple) and len(item) == 2:
             return item in self._coordinates_map
         return False
@@ -1,14 +1,17 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Tuple, Dict, Optional, Set
 from datetime import datetime
 from dataclasses import dataclass, field
-from utils import calculate_stop_times, AVERAGE_SPEED_KPH
+from utils import AVERAGE_SPEED_KPH
 
 class RouteConstraints(BaseModel):
-    one_way_roads: List[Tuple[Tuple[float, float], Tuple[float, float]]] = []
+    one_way_roads: List[Tuple[Tuple[float, float], Tuple[float, float]]] = Field(default_factory=list)
 
 # Core Models
-class Location(BaseModel):
+# Built once per CSV row, so a plain dataclass; pydantic still validates it inside Config
+# and API bodies. Not slotted, as pydantic v1 writes validated values to the instance __dict__.
+@dataclass
+class Location:
     id: str
     name: str
     coordinates: Tuple[float, float]
@@ -22,9 +25,6 @@ class Location(BaseModel):
     def str(self):
         return f"{self.name} (ID: {self.id}, WCO: {self.wco_amount}L)"
 
-    class Config:
-        underscore_attrs_are_private = True
-
 class Vehicle(BaseModel):
     id: str
     capacity: float
@@ -57,7 +57,7 @@ class ScheduleEntry(BaseModel):
         frozen = True  # Make the model immutable and hashable
 
 # Route and Stop Models
-@dataclass
+@dataclass(slots=True)
 class Stop:
     location_id: str
     location_name: str
@@ -73,7 +73,7 @@ class Stop:
     def __hash__(self):
         return hash(self.location_id)
 
-@dataclass
+@dataclass(slots=True)
 class VehicleRoute:
     vehicle_id: int
     stops: List[Stop]
@@ -83,7 +83,7 @@ class VehicleRoute:
     collection_day: int = 1
     speed_kph: float = AVERAGE_SPEED_KPH
 
-@dataclass
+@dataclass(slots=True)
 class StopInfo:
     """Information about a single stop in a route"""
     name: str
@@ -102,7 +102,7 @@ class StopInfo:
     collection_day: int
 
 # Collection Models
-@dataclass
+@dataclass(slots=True)
 class CollectionStop:
     location_id: str
     location_name: str
@@ -116,7 +116,7 @@ class CollectionStop:
     collection_time: int = 0  # Collection time in seconds
     travel_time: int = 0      # Travel time in seconds
 
-@dataclass
+@dataclass(slots=True)
 class CollectionData:
     vehicle_id: str
     day: int
@@ -128,19 +128,25 @@ class CollectionData:
     collection_timestamp: datetime
     collection_time_minutes: float = 15.0  # Default 15 minutes per stop
     speed_kph: float = AVERAGE_SPEED_KPH # Average speed in Davao City
+    total_collection_time: int = 0  # Total collection time in seconds
+    total_travel_time: int = 0      # Total travel time in seconds
+    current_load: float = 0.0       # Load after the last stop, kept up to date by add_stop
+    _collection_time_seconds: int = field(default=0, init=False, repr=False, compare=False)
+    _travel_seconds_per_km: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Both are constant for the whole trip, so work them out once instead of per stop
+        self._collection_time_seconds = int(self.collection_time_minutes * 60)
+        self._travel_seconds_per_km = 3600.0 / self.speed_kph
 
     def add_stop(self, location: Location, distance_from_prev: float) -> None:
         """Add a stop to the collection data"""
-        # Calculate cumulative load
-        current_load = sum(stop.amount_collected for stop in self.stops)
+        # Cumulative load is tracked as stops are added instead of re-summed each time
+        current_load = self.current_load
         
-        # Calculate times using utility function with pre-calculated distance
-        collection_time, travel_time, _ = calculate_stop_times(
-            location=location,
-            collection_time_minutes=self.collection_time_minutes,
-            speed_kph=self.speed_kph,
-            distance_from_prev=distance_from_prev
-        )
+        # Every stop takes the trip's fixed collection time (see estimate_collection_time)
+        collection_time = self._collection_time_seconds
+        travel_time = int(distance_from_prev * self._travel_seconds_per_km)
         
         # Create new stop
         new_stop = CollectionStop(
@@ -153,18 +159,21 @@ class CollectionData:
             distance_from_prev=distance_from_prev,
             trip_number=self.trip_number,
             collection_day=self.day,
-            collection_time=int(collection_time * 60),  # Convert to seconds
-            travel_time=int(travel_time * 60)  # Convert to seconds
+            collection_time=collection_time,
+            travel_time=travel_time
         )
         
         # Update collection data
         self.stops.append(new_stop)
         self.visited_location_ids.add(location.id)
         self.total_collected += location.wco_amount
+        self.current_load = current_load + location.wco_amount
         self.total_distance += distance_from_prev
+        self.total_collection_time += collection_time
+        self.total_travel_time += travel_time
 
 # Analysis Models
-@dataclass
+@dataclass(slots=True)
 class RoutePathInfo:
     from_coords: Tuple[float, float]
     to_coords: Tuple[float, float]
@@ -172,7 +181,7 @@ class RoutePathInfo:
     trip_number: int = 0
     travel_time_minutes: float = 0.0  # Add travel time field
 
-@dataclass
+@dataclass(slots=True)
 class VehicleRouteInfo:
     vehicle_id: str
     capacity: float
@@ -187,7 +196,7 @@ class VehicleRouteInfo:
     total_travel_time: int = field(default=0)      # Total travel time in seconds
     trip_paths: Dict[int, List[RoutePathInfo]] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class TripAnalysisResult:
     collection_day: int
     total_locations: int
@@ -199,7 +208,7 @@ class TripAnalysisResult:
     total_stops: int
     vehicle_routes: List[VehicleRouteInfo]
 
-@dataclass
+@dataclass(slots=True)
 class RouteAnalysisResult:
     schedule_id: str
     schedule_name: str
@@ -216,30 +225,41 @@ class RouteAnalysisResult:
     total_travel_time: int = 0      # Total travel time in seconds
     base_schedule_id: str = ""  # Add reference to original schedule
     base_schedule_day: int = 0  # Add reference to base frequency day
+    _trip_by_day: Dict[int, TripAnalysisResult] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     @property
     def vehicle_routes(self) -> List[VehicleRouteInfo]:
         """Compatibility property that returns vehicle routes from the current trip."""
-        if not self.trips:
-            return []
         return [route for trip in self.trips for route in trip.vehicle_routes]
 
     def get_trip(self, trip_number: int) -> Optional[TripAnalysisResult]:
         """Get trip analysis result by trip number."""
-        return next((trip for trip in self.trips if trip.collection_day == trip_number), None)
+        return self._trip_by_day.get(trip_number)
 
     def get_vehicle_routes(self, trip_number: int) -> List[VehicleRouteInfo]:
         """Get vehicle routes for a specific trip number."""
         trip = self.get_trip(trip_number)
         return trip.vehicle_routes if trip else []
 
+    def add_trip(self, trip: TripAnalysisResult) -> None:
+        """Append a trip and add its numbers to the day totals; use this rather than trips.append so get_trip sees it."""
+        self.trips.append(trip)
+        self._index_trip(trip)
+        self.total_trips += 1
+        self.total_locations += trip.total_locations
+        self.total_distance += trip.total_distance
+        self.total_collected += trip.total_collected
+        self.total_collection_time += trip.total_collection_time
+        self.total_travel_time += trip.total_travel_time
+        self.total_stops += trip.total_stops
+
+    def _index_trip(self, trip: TripAnalysisResult) -> None:
+        # Keep the first trip when days repeat
+        self._trip_by_day.setdefault(trip.collection_day, trip)
+
     def __post_init__(self):
-        if self.total_trips == 0:
-            self.total_trips = sum(trip.total_trips for trip in self.trips)
-        if self.total_stops == 0:
-            self.total_stops = sum(trip.total_stops for trip in self.trips)
         if not self.base_schedule_id:
             self.base_schedule_id = self.schedule_id.split('_day')[0]
-        # Sum up total times
-        self.total_collection_time = sum(trip.total_collection_time for trip in self.trips)
-        self.total_travel_time = sum(trip.total_travel_time for trip in self.trips)
+        # Trips passed to the constructor are indexed; their totals are taken as given
+        for trip in self.trips:
+            self._index_trip(trip)
@@ -1,8 +1,11 @@
 from models.shared_models import CollectionData, VehicleRoute, Location
 from dataclasses import dataclass, field
-from typing import Dict, Tuple, Set
+from typing import Dict, List, Tuple, Set
 from datetime import datetime
-from utils import calculate_distance, MAX_DAILY_TIME, AVERAGE_SPEED_KPH, calculate_stop_times, calculate_total_time
+from utils import calculate_distance, calculate_distances, MAX_DAILY_TIME, AVERAGE_SPEED_KPH, calculate_stop_times, calculate_total_time
+import logging
+
+logger = logging.getLogger(__name__)
 
 @dataclass
 class TripCollection:
@@ -10,10 +13,12 @@ class TripCollection:
     vehicle_collections: Dict[Tuple[int, int, int], CollectionData] = field(default_factory=dict)
     total_times: Dict[int, float] = field(default_factory=dict)
     _exceeds_daily_time: Dict[int, bool] = field(default_factory=dict)
+    _collections_by_vehicle_day: Dict[Tuple[int, int], List[CollectionData]] = field(default_factory=dict)  # (vehicle, day) -> trips, in creation order
     total_trips: int = 0
     total_stops: int = 0
     speed_kph: float = AVERAGE_SPEED_KPH
     max_daily_time: int = MAX_DAILY_TIME
+    session_timestamp: datetime = field(default_factory=datetime.now)  # Shared by every trip registered in this session
 
     def exceeds_daily_time(self, day: int) -> bool:
         """
@@ -35,31 +40,20 @@ class TripCollection:
         if day in self._exceeds_daily_time:
             self._exceeds_daily_time[day] = False
     
-    def register_collection(self, 
-                           vehicle_id: int,
-                           day: int, 
-                           trip_number: int,
-                           location: Location,
-                           depot_location: tuple[int, int] | None = None,
-                           collection_time_minutes: float = 15.0) -> bool:
-        """
-        Register a collection for a specific vehicle on a specific day and trip
-        Returns True if successfully registered, False otherwise
-        """
+    def _get_or_create_collection(self,
+                                  vehicle_id: int,
+                                  day: int,
+                                  trip_number: int,
+                                  collection_time_minutes: float) -> CollectionData:
+        """Get the collection data for a vehicle, day and trip, creating it for new trips"""
         key = (vehicle_id, day, trip_number)
         time_key = day
 
-        if self.exceeds_daily_time(day):
-            print(f"Warning: Daily time limit exceeded for day {day}. Cannot register new collection.")
-            return False
-        
-        # Track new trips
-        if key not in self.vehicle_collections:
+        # Get or create collection data for this key, counting new trips
+        collection = self.vehicle_collections.get(key)
+        if collection is None:
             self.total_trips += 1
-        
-        # Get or create collection data for this key
-        if key not in self.vehicle_collections:
-            self.vehicle_collections[key] = CollectionData(
+            collection = self.vehicle_collections[key] = CollectionData(
                 vehicle_id=vehicle_id,
                 day=day,
                 trip_number=trip_number,
@@ -67,23 +61,72 @@ class TripCollection:
                 total_collected=0.0,
                 total_distance=0.0,
                 stops=[],
-                collection_timestamp=datetime.now(),
+                collection_timestamp=self.session_timestamp,
                 collection_time_minutes=collection_time_minutes,
                 speed_kph=self.speed_kph
             )
+            self._collections_by_vehicle_day.setdefault((vehicle_id, day), []).append(collection)
+
+        self.total_times.setdefault(time_key, 0.0)
+
+        return collection
+
+    def _add_collection_stop(self,
+                             collection: CollectionData,
+                             location: Location,
+                             distance: float,
+                             day: int,
+                             collection_time_minutes: float) -> None:
+        """Check the daily time budget and add a stop whose distance from the previous stop is known"""
+        collection_time, travel_time, depot_return_time = calculate_stop_times(
+            location=location,
+            collection_time_minutes=collection_time_minutes,
+            speed_kph=self.speed_kph,
+            distance_from_prev=distance
+        )
+
+        prev_total_time = self.total_times.get(day, 0.0)
+        total_time = prev_total_time + calculate_total_time(collection_time, travel_time, depot_return_time)
 
-        if time_key not in self.total_times:
-            self.total_times[time_key] = 0.0
+        if total_time > self.max_daily_time:
+            logger.warning("Adding %s exceeds daily time limit for day %d", location.name, day)
+            self._exceeds_daily_time[day] = False
+            # return False
+        else:
+            logger.debug("total_time: %s, max_daily_time: %s", total_time, self.max_daily_time)
+
+        # Register collection with distance
+        collection.add_stop(location, distance)
+        self.total_stops += 1
+        # self.total_times[day] = total_time
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Collecting %s (Total trips: %d, Total stops: %d)", location.str(), self.total_trips, self.total_stops)
+
+    def register_collection(self, 
+                           vehicle_id: int,
+                           day: int, 
+                           trip_number: int,
+                           location: Location,
+                           depot_location: tuple[int, int] | None = None,
+                           collection_time_minutes: float = 15.0) -> bool:
+        """
+        Register a collection for a specific vehicle on a specific day and trip
+        Returns True if successfully registered, False otherwise
+        """
+        if self.exceeds_daily_time(day):
+            logger.warning("Daily time limit exceeded for day %d. Cannot register new collection.", day)
+            return False
+        
+        collection = self._get_or_create_collection(vehicle_id, day, trip_number, collection_time_minutes)
         
         # Check if location already visited on this day
-        if location.id in self.vehicle_collections[key].visited_location_ids:
-            print(f"Warning: Location {location.name} already visited on day {day} by vehicle {vehicle_id}. Ignoring duplicate.")
+        if location.id in collection.visited_location_ids:
+            logger.warning("Location %s already visited on day %d by vehicle %s. Ignoring duplicate.", location.name, day, vehicle_id)
             return False
         
-        is_depot_location = location.coordinates[0] == depot_location[0] and location.coordinates[1] == depot_location[1] if depot_location else False
+        is_depot_location = depot_location is not None and location.coordinates == depot_location
             
         # Calculate distance from previous stop or depot
-        collection = self.vehicle_collections[key]
         if not collection.stops:
             if depot_location and not is_depot_location:
                 distance = calculate_distance(depot_location, location.coordinates)
@@ -93,52 +136,83 @@ class TripCollection:
             prev_stop = collection.stops[-1]
             distance = calculate_distance(prev_stop.coordinates, location.coordinates)
 
-        prev_location = collection.stops[-1].coordinates if collection.stops else None
-        collection_time, travel_time, depot_return_time = calculate_stop_times(
-            location=location,
-            depot_location=depot_location,
-            prev_location=prev_location,
-            collection_time_minutes=collection_time_minutes,
-            speed_kph=self.speed_kph
-        )
+        self._add_collection_stop(collection, location, distance, day, collection_time_minutes)
+        return True
 
-        prev_total_time = self.total_times.get(time_key, 0.0)
-        total_time = prev_total_time + calculate_total_time(collection_time, travel_time, depot_return_time)
+    def register_collection_batch(self,
+                                  vehicle_id: int,
+                                  day: int,
+                                  trip_number: int,
+                                  locations: List[Location],
+                                  depot_location: tuple[int, int] | None = None,
+                                  collection_time_minutes: float = 15.0) -> List[bool]:
+        """
+        Register collections for a specific vehicle on a specific day and trip, in visiting order.
+        The distances between consecutive stops are calculated in a single vectorized pass.
+        Returns a list with True for each successfully registered location, False otherwise
+        """
+        if self.exceeds_daily_time(day):
+            logger.warning("Daily time limit exceeded for day %d. Cannot register new collection.", day)
+            return [False] * len(locations)
 
-        if total_time > self.max_daily_time:
-            print(f"Warning: Adding {location.name} exceeds daily time limit for day {day}")
-            self._exceeds_daily_time[day] = False
-            # return False
+        collection = self._get_or_create_collection(vehicle_id, day, trip_number, collection_time_minutes)
+
+        # Skip locations already visited on this day, including repeats within the batch
+        registered = []
+        new_locations: List[Location] = []
+        visited = set(collection.visited_location_ids)
+        for location in locations:
+            if location.id in visited:
+                logger.warning("Location %s already visited on day %d by vehicle %s. Ignoring duplicate.", location.name, day, vehicle_id)
+                registered.append(False)
+                continue
+
+            visited.add(location.id)
+            new_locations.append(location)
+            registered.append(True)
+
+        if not new_locations:
+            return registered
+
+        # The first stop is measured from the previous stop, else from the depot.
+        # Without either, it is measured from itself (zero distance).
+        if collection.stops:
+            start = collection.stops[-1].coordinates
+        elif depot_location:
+            start = depot_location
         else:
-            print(f"[trip_collection] total_time: {total_time}, max_daily_time: {self.max_daily_time}")
+            start = new_locations[0].coordinates
 
-        # Register collection with distance
-        collection.add_stop(location, distance)
-        self.total_stops += 1
-        # self.total_times[time_key] = total_time
-        print(f"Collecting {location.str()} (Total trips: {self.total_trips}, Total stops: {self.total_stops})")
-        return True
+        path = [start] + [location.coordinates for location in new_locations]
+        distances = calculate_distances(path[:-1], path[1:])
+
+        for location, distance in zip(new_locations, distances):
+            self._add_collection_stop(collection, location, float(distance), day, collection_time_minutes)
+
+        return registered
         
     def get_visited_locations(self, vehicle_id: int, day: int) -> Set[str]:
         """Get set of location IDs visited by a vehicle on a specific day"""
         visited = set()
-        for key, collection in self.vehicle_collections.items():
-            if key[0] == vehicle_id and key[1] == day:
-                visited.update(collection.visited_location_ids)
+        for collection in self.get_collections(vehicle_id, day):
+            visited.update(collection.visited_location_ids)
         return visited
+
+    def get_collections(self, vehicle_id: int, day: int) -> List[CollectionData]:
+        """Get the trips of a vehicle on a specific day, in the order they were started"""
+        return self._collections_by_vehicle_day.get((vehicle_id, day), [])
         
     def get_vehicle_route(self, vehicle_id: int, day: int) -> VehicleRoute:
         """Generate vehicle route for a specific day"""
         stops = []
         total_distance = 0.0
+        total_collected = 0.0
         
-        # Collect all stops for this vehicle on this day
-        for collection in self.vehicle_collections.values():
-            if collection.vehicle_id != vehicle_id or collection.day != day:
-                continue
-
+        # Collect all stops for this vehicle on this day, reusing each trip's running totals
+        for collection in self.get_collections(vehicle_id, day):
             stops.extend(collection.stops)
             total_distance += collection.total_distance
+            total_collected += collection.total_collected
         
         # Create route
         return VehicleRoute(
@@ -146,6 +220,6 @@ class TripCollection:
             stops=stops,
             total_distance=total_distance,
             initial_capacity=0.0,  # Will be set elsewhere
-            total_collected=sum(stop.amount_collected for stop in stops),
+            total_collected=total_collected,
             speed_kph=self.speed_kph
         )
@@ -1,4 +1,5 @@
 import numpy as np
+from math import ceil
 from typing import List, Dict, Tuple, Iterable
 from models.location import Location, Vehicle
 from models.shared_models import ScheduleEntry
@@ -99,12 +100,13 @@ class CollectionScheduler:
                             )
 
         # Check for missing or excess visits
+        max_capacity = max((v.capacity for v in vehicles), default=0)
         for loc_id, visits in location_visits.items():
             if visits == 0:
                 issues.append(f"Location {loc_id} was not assigned to any vehicle")
             elif visits > 1:
                 wco_amount = location_loads.get(loc_id, 0)
-                min_visits = int(np.ceil(wco_amount / max(v.capacity for v in vehicles)))
+                min_visits = ceil(wco_amount / max_capacity)
                 if visits > min_visits:
                     issues.append(
                         f"Location {loc_id} has excess visits ({visits} vs needed {min_visits})"
@@ -2,7 +2,8 @@ from abc import ABC, abstractmethod
 from typing import List, Tuple
 from models.location import Location, Vehicle, RouteConstraints
 from math import radians, sin, cos, sqrt, atan2
-from utils import calculate_distance
+from utils import calculate_distance, calculate_distances
+import numpy as np
 
 class BaseSolver(ABC):
     id = "base_solver"
@@ -23,6 +24,10 @@ class BaseSolver(ABC):
     def _calculate_distance(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
         return calculate_distance(coord1, coord2)
 
+    def _calculate_distances_from(self, coord: Tuple[float, float], coords: np.ndarray) -> np.ndarray:
+        """Distances from one coordinate to each row of an (N, 2) coordinate array, in one vectorized pass"""
+        return calculate_distances(coord, coords)
+
     def calculate_route_distance(self, route: List[Tuple[float, float]]) -> float:
         """Calculate total distance of a route"""
         total_distance = 0.0
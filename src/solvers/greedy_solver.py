@@ -2,6 +2,7 @@ from typing import List
 from models.location import Location, Vehicle, RouteConstraints
 from .base_solver import BaseSolver
 import heapq
+import numpy as np
 
 class GreedySolver(BaseSolver):
     id = "greedy_solver"
@@ -35,23 +36,25 @@ class GreedySolver(BaseSolver):
         remaining_capacity = vehicle.capacity
         available_locations = location_priorities.copy()
         current_pos = self.depot_location
+
+        # Coordinates and amounts of the available locations, kept in the same order
+        available_coords = np.array(
+            [self.locations[loc_idx].coordinates for _, loc_idx in available_locations], dtype=np.float64
+        ).reshape(-1, 2)
+        available_amounts = np.array([self.locations[loc_idx].wco_amount for _, loc_idx in available_locations], dtype=np.float64)
         
         while available_locations:
             best_location = None
-            best_idx = -1
-            best_distance = float('inf')
-            
-            for i, (priority, loc_idx) in enumerate(available_locations):
-                location = self.locations[loc_idx]
-                
-                if location.wco_amount > remaining_capacity:
-                    continue
-                
-                dist = self._calculate_distance(current_pos, location.coordinates)
-                if dist < best_distance:
-                    best_distance = dist
-                    best_location = location
-                    best_idx = i
+
+            # Measure every candidate at once, ruling out the ones that do not fit
+            distances = np.where(
+                available_amounts > remaining_capacity,
+                np.inf,
+                self._calculate_distances_from(current_pos, available_coords)
+            )
+            best_idx = int(np.argmin(distances))
+            if distances[best_idx] != np.inf:
+                best_location = self.locations[available_locations[best_idx][1]]
                     
             if best_location is None:
                 route.append(None)  # Return to depot
@@ -63,6 +66,8 @@ class GreedySolver(BaseSolver):
             remaining_capacity -= best_location.wco_amount
             current_pos = best_location.coordinates
             available_locations.pop(best_idx)
+            available_coords = np.delete(available_coords, best_idx, axis=0)
+            available_amounts = np.delete(available_amounts, best_idx)
             
             if remaining_capacity < 100:  # Minimum threshold
                 route.append(None)  # Return to depot
@@ -1,6 +1,7 @@
 from models.location import Location, Vehicle, RouteConstraints
 from .base_solver import BaseSolver
 from typing import List
+import numpy as np
 
 class NearestNeighborSolver(BaseSolver):
     id = "nearest_neighbor_solver"
@@ -14,6 +15,8 @@ class NearestNeighborSolver(BaseSolver):
     def solve(self) -> List[List[Location]]:
         """Solve CVRP using nearest neighbor approach with capacity prioritization"""
         routes = []
+        coords = np.array([loc.coordinates for loc in self.locations], dtype=np.float64).reshape(-1, 2)
+        amounts = np.array([loc.wco_amount for loc in self.locations], dtype=np.float64)
         
         # Sort locations by distance (farthest first) for initial assignments
         sorted_locations = sorted(
@@ -28,26 +31,26 @@ class NearestNeighborSolver(BaseSolver):
             remaining_locs = set(i for i, _ in sorted_locations)
             
             while remaining_locs:
-                best_loc_idx = None
-                best_distance = float('inf')
-                
-                for loc_idx in remaining_locs:
-                    location = self.locations[loc_idx]
-                    
-                    if current_load + location.wco_amount > vehicle.capacity:
-                        if current_pos != self.depot_location:
-                            route.append(None)  # Return to depot
-                            current_load = 0.0
-                            current_pos = self.depot_location
-                    
-                    dist = self._calculate_distance(current_pos, location.coordinates)
-                    if dist < best_distance:
-                        best_distance = dist
-                        best_loc_idx = loc_idx
-                
-                if best_loc_idx is None:
-                    break
-                    
+                candidates = list(remaining_locs)
+                candidate_coords = coords[candidates]
+
+                # The first candidate that does not fit sends the vehicle back to the depot,
+                # so it and every candidate after it are measured from the depot instead
+                does_not_fit = current_load + amounts[candidates] > vehicle.capacity
+                if current_pos != self.depot_location and does_not_fit.any():
+                    first_return = int(np.argmax(does_not_fit))
+                    distances = np.empty(len(candidates))
+                    distances[:first_return] = self._calculate_distances_from(current_pos, candidate_coords[:first_return])
+
+                    route.append(None)  # Return to depot
+                    current_load = 0.0
+                    current_pos = self.depot_location
+                    distances[first_return:] = self._calculate_distances_from(current_pos, candidate_coords[first_return:])
+                else:
+                    distances = self._calculate_distances_from(current_pos, candidate_coords)
+
+                # argmin keeps the first of equally near candidates, like the strict < scan did
+                best_loc_idx = candidates[int(np.argmin(distances))]
                 best_loc = self.locations[best_loc_idx]
                 route.append(best_loc)
                 current_load += best_loc.wco_amount
@@ -2,21 +2,43 @@ from ortools.constraint_solver import pywrapcp, routing_enums_pb2
 from ortools.constraint_solver.pywrapcp import RoutingIndexManager, RoutingModel
 from models.location import Location, Vehicle, RouteConstraints
 from .base_solver import BaseSolver
-from typing import List
-from utils import MAX_DAILY_TIME, AVERAGE_SPEED_KPH, estimate_travel_time
+from typing import Dict, List, Tuple
+from utils import MAX_DAILY_TIME, AVERAGE_SPEED_KPH, calculate_distance_matrix
 
+import numpy as np
 import traceback
 
+DISTANCE_SCALE = 10_000  # Arc costs are integers, so keep distances to 0.1 m
+
 class ORToolsSolver(BaseSolver):
     id = "or_tools_solver"
     name = "Google OR-Tools Solver"
     description = "Advanced optimization solver using Google's Operations Research tools. Best for complex routing problems."
 
-    def __init__(self, locations: list[Location], vehicles: list[Vehicle], constraints: RouteConstraints, stop_time: int = 15, speed_kph: int = AVERAGE_SPEED_KPH, max_daily_time: int = MAX_DAILY_TIME):
+    def __init__(self, locations: list[Location], vehicles: list[Vehicle], constraints: RouteConstraints, stop_time: int = 15, speed_kph: int = AVERAGE_SPEED_KPH, max_daily_time: int = MAX_DAILY_TIME, distance_matrix: np.ndarray | None = None):
         super().__init__(locations, vehicles, constraints)
         self.stop_time = stop_time
         self.speed_kph = speed_kph
         self.max_daily_time = max_daily_time
+        # Distances in km between the locations, in the same order as `locations`
+        self.distance_matrix = distance_matrix
+
+    def _build_transit_matrices(self, depot_index: int) -> tuple[list[list[int]], list[list[int]]]:
+        """Build the integer distance and time matrices used for the arc costs and the time dimension"""
+        distances = self.distance_matrix
+        if distances is None:
+            coords = [loc.coordinates for loc in self.locations]
+            distances = calculate_distance_matrix(coords, coords)
+
+        distance_matrix = np.rint(distances * DISTANCE_SCALE).astype(np.int32)
+
+        # Travel time rounded to the nearest minute, plus the service time of the from-node (except depot)
+        time_matrix = np.rint(distances / self.speed_kph * 60).astype(np.int32)
+        service_time = np.full((len(self.locations), 1), int(self.stop_time), dtype=np.int32)
+        service_time[depot_index] = 0
+        time_matrix += service_time
+
+        return distance_matrix.tolist(), time_matrix.tolist()
 
     def solve(self):
         # Handle edge cases
@@ -45,63 +67,33 @@ class ORToolsSolver(BaseSolver):
         
         routing = pywrapcp.RoutingModel(manager)
 
-        # Distance callback
-        def distance_callback(from_index, to_index):
-            try:
-                from_node = manager.IndexToNode(from_index)
-                to_node = manager.IndexToNode(to_index)
-                distance = self._calculate_distance(
-                    self.locations[from_node].coordinates,
-                    self.locations[to_node].coordinates
-                )
-                return int(round(distance))  # Ensure integer return
-            except Exception as e:
-                print(f"Error in distance_callback: {str(e)}")
-                return 0
+        # Precomputed matrices avoid calling back into Python for every arc evaluation
+        distance_matrix, time_matrix = self._build_transit_matrices(depot_index)
 
-        transit_callback_index = routing.RegisterTransitCallback(distance_callback)
+        transit_callback_index = routing.RegisterTransitMatrix(distance_matrix)
         routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
 
-        # Add one-way road constraints using forbidden transitions
+        # Add one-way road constraints using forbidden transitions.
+        # Index the locations by coordinates once (first match wins) instead of scanning them per road.
+        coord_to_index: Dict[Tuple[float, float], int] = {}
+        if self.constraints.one_way_roads:
+            for i, loc in enumerate(self.locations):
+                coord_to_index.setdefault(loc.coordinates, i)
+
         for from_loc, to_loc in self.constraints.one_way_roads:
-            try:
-                from_index = next(i for i, loc in enumerate(self.locations) 
-                                if loc.coordinates == tuple(from_loc))
-                to_index = next(i for i, loc in enumerate(self.locations) 
-                              if loc.coordinates == tuple(to_loc))
-                
-                # Forbid travel in the opposite direction of one-way road
-                routing.NextVar(manager.NodeToIndex(to_index)).RemoveValue(
-                    manager.NodeToIndex(from_index)
-                )
-            except StopIteration:
+            from_index = coord_to_index.get(tuple(from_loc))
+            to_index = coord_to_index.get(tuple(to_loc))
+            if from_index is None or to_index is None:
                 print(f"Warning: One-way road locations not found in current schedule")
                 continue
 
-        # Define time window constraints with scheduler constants
-        def time_callback(from_index, to_index):
-            try:
-                from_node = manager.IndexToNode(from_index)
-                to_node = manager.IndexToNode(to_index)
-                
-                # Add service time for the from_node (except depot)
-                service_time = 0
-                if from_node != depot_index:
-                    service_time = self.stop_time
-                
-                # Calculate travel time
-                distance = self._calculate_distance(
-                    self.locations[from_node].coordinates,
-                    self.locations[to_node].coordinates
-                )
-                
-                travel_time = round(estimate_travel_time(distance, self.speed_kph))  # Round to nearest minute
-                return int(travel_time + service_time)  # Ensure integer return
-            except Exception as e:
-                print(f"Error in time_callback: {str(e)}")
-                return int(self.stop_time)
+            # Forbid travel in the opposite direction of one-way road
+            routing.NextVar(manager.NodeToIndex(to_index)).RemoveValue(
+                manager.NodeToIndex(from_index)
+            )
 
-        time_callback_index = routing.RegisterTransitCallback(time_callback)
+        # Define time window constraints with scheduler constants
+        time_callback_index = routing.RegisterTransitMatrix(time_matrix)
         routing.AddDimension(
             time_callback_index,
             60,  # Allow 60 minute slack for breaks
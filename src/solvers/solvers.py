@@ -1,14 +1,38 @@
-from .or_tools_solver import ORToolsSolver
-from .greedy_solver import GreedySolver
-from .nearest_neighbor_solver import NearestNeighborSolver
-from .basic_solver import BasicSolver
+from collections.abc import Mapping
+from importlib import import_module
+from typing import Dict, Iterator, Type
+from .base_solver import BaseSolver
+
+ORTOOLS_SOLVER_ID = "or_tools_solver"
+
+class LazySolverMap(Mapping):
+    """Solver mapping that only imports a solver's module the first time it is looked up"""
+
+    def __init__(self, solver_paths: Dict[str, str]):
+        self._solver_paths = solver_paths  # solver id -> "module:ClassName"
+        self._solvers: Dict[str, Type[BaseSolver]] = {}
+
+    def __getitem__(self, solver_id: str) -> Type[BaseSolver]:
+        if solver_id not in self._solvers:
+            module_name, class_name = self._solver_paths[solver_id].split(':')
+            self._solvers[solver_id] = getattr(import_module(module_name, __package__), class_name)
+        return self._solvers[solver_id]
+
+    def __contains__(self, solver_id) -> bool:
+        return solver_id in self._solver_paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._solver_paths)
+
+    def __len__(self) -> int:
+        return len(self._solver_paths)
 
 # Solver mapping
-SOLVERS = {
-    ORToolsSolver.id: ORToolsSolver,
-    GreedySolver.id: GreedySolver,
-    NearestNeighborSolver.id: NearestNeighborSolver,
-    BasicSolver.id: BasicSolver,
-}
-
-DEFAULT_SOLVER_ID = BasicSolver.id
\ No newline at end of file
+SOLVERS = LazySolverMap({
+    ORTOOLS_SOLVER_ID: '.or_tools_solver:ORToolsSolver',
+    "greedy_solver": '.greedy_solver:GreedySolver',
+    "nearest_neighbor_solver": '.nearest_neighbor_solver:NearestNeighborSolver',
+    "basic_solver": '.basic_solver:BasicSolver',
+})
+
+DEFAULT_SOLVER_ID = "basic_solver"
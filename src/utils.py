@@ -1,22 +1,74 @@
 from math import radians, sin, cos, sqrt, atan2
-from typing import Tuple
+from typing import Tuple, Sequence
+import numpy as np
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 AVERAGE_SPEED_KPH = 30  # Average speed in Davao City
 MAX_DAILY_TIME = 7 * 60  # Total working day in minutes (from CollectionScheduler)
 
-def calculate_distance(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
-    """Calculate distance between coordinates using Haversine formula"""
-    lat1, lon1 = map(radians, coord1)
-    lat2, lon2 = map(radians, coord2)
+def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine distance in km between two points given in degrees"""
+    lat1 = radians(lat1)
+    lat2 = radians(lat2)
     
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
+    sin_dlat = sin((lat2 - lat1) * 0.5)
+    sin_dlon = sin(radians(lon2 - lon1) * 0.5)
     
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+    a = sin_dlat * sin_dlat + cos(lat1) * cos(lat2) * sin_dlon * sin_dlon
     c = 2 * atan2(sqrt(a), sqrt(1-a))
     
     return 6371 * c  # Earth's radius in km
 
+# Compile the scalar kernel when Numba is installed; the compiled code is cached on disk
+if njit is not None:
+    _haversine = njit(cache=True, fastmath=True)(_haversine)
+
+def calculate_distance(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
+    """Calculate distance between coordinates using Haversine formula"""
+    return _haversine(coord1[0], coord1[1], coord2[0], coord2[1])
+
+def calculate_distance_matrix(coords1: Sequence[Tuple[float, float]], coords2: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """Calculate pairwise Haversine distances between two sets of coordinates (rows: coords1, cols: coords2)"""
+    lat1, lon1 = np.radians(np.asarray(coords1, dtype=np.float64).reshape(-1, 2)).T
+    lat2, lon2 = np.radians(np.asarray(coords2, dtype=np.float64).reshape(-1, 2)).T
+
+    # Work in two preallocated buffers with in-place ufuncs so that large
+    # matrices do not allocate a new temporary for every arithmetic step
+    a = np.subtract.outer(lat1, lat2)
+    a *= 0.5
+    np.sin(a, out=a)
+    np.square(a, out=a)
+
+    b = np.subtract.outer(lon1, lon2)
+    b *= 0.5
+    np.sin(b, out=b)
+    np.square(b, out=b)
+    b *= np.cos(lat1)[:, np.newaxis]
+    b *= np.cos(lat2)[np.newaxis, :]
+    a += b
+
+    # c = 2 * atan2(sqrt(a), sqrt(1-a))
+    np.subtract(1, a, out=b)
+    np.sqrt(b, out=b)
+    np.sqrt(a, out=a)
+    np.arctan2(a, b, out=a)
+    a *= 2 * 6371  # Earth's radius in km
+
+    return a
+
+def calculate_distances(coords1, coords2) -> np.ndarray:
+    """Calculate element-wise Haversine distances between paired coordinates (broadcasts like NumPy arrays of shape (..., 2))"""
+    lat1, lon1 = np.moveaxis(np.radians(np.asarray(coords1, dtype=np.float64)), -1, 0)
+    lat2, lon2 = np.moveaxis(np.radians(np.asarray(coords2, dtype=np.float64)), -1, 0)
+
+    a = np.sin((lat2 - lat1) * 0.5)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) * 0.5)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+
+    return 6371 * c  # Earth's radius in km
+
 def estimate_collection_time(location, max_stop_time: float = 15.0) -> float:
     """Estimate collection time based on WCO amount, capped at max_stop_time"""
     # base_time = 3 + (location.wco_amount / 100) * 4  # Base 3 mins + up to 4 more based on volume
@@ -45,10 +45,21 @@ class RouteVisualizer:
         self.client = ors.Client(key=api_key, base_url=ors_base_url)
         # Store the computed road paths
         self.computed_paths = {}
+        # Road geometry per (start, end) leg, kept across clear_routes() so repeated legs skip ORS
+        self._road_path_cache: Dict[Tuple[Tuple[float, float], Tuple[float, float]], List[List[float]]] = {}
+
+    def clear_routes(self):
+        """Start a fresh map without routes, keeping the ORS client and road path cache."""
+        self.map = folium.Map(location=self.center, zoom_start=13)
+        self.computed_paths = {}
 
     def _get_route_coordinates(self, start_coords: Tuple[float, float], 
                              end_coords: Tuple[float, float]) -> List[List[float]]:
         """Get the actual road route between two points using OpenRouteService."""
+        cache_key = (tuple(start_coords), tuple(end_coords))
+        if cache_key in self._road_path_cache:
+            return self._road_path_cache[cache_key]
+
         try:
             coords = [[start_coords[1], start_coords[0]], 
                      [end_coords[1], end_coords[0]]]  # ORS uses [long, lat]
@@ -59,7 +70,9 @@ class RouteVisualizer:
                 format='geojson',
                 optimize_waypoints=True
             )
-            return route['features'][0]['geometry']['coordinates']
+            road_coords = route['features'][0]['geometry']['coordinates']
+            self._road_path_cache[cache_key] = road_coords
+            return road_coords
         except Exception as e:
             print(f"Error getting route: {e}")
             # Fallback to straight line if routing fails
@@ -80,6 +93,9 @@ class RouteVisualizer:
             </div>
         """).add_to(self.map)
 
+        # Paths computed for this analysis, looked up once rather than per vehicle route
+        schedule_paths = self.computed_paths.get(analysis.schedule_id)
+
         # Process each trip
         for trip in analysis.trips:
             # Process vehicle routes for this trip
@@ -105,9 +121,9 @@ class RouteVisualizer:
                 route_info.trip_paths[trip.collection_day] = trip_paths
                 
                 # Store computed paths for this analysis
-                if analysis.schedule_id not in self.computed_paths:
-                    self.computed_paths[analysis.schedule_id] = {}
-                self.computed_paths[analysis.schedule_id][route_info.vehicle_id] = trip_paths
+                if schedule_paths is None:
+                    schedule_paths = self.computed_paths[analysis.schedule_id] = {}
+                schedule_paths[route_info.vehicle_id] = trip_paths
 
         # Fit bounds to show all markers
         self._fit_bounds_to_markers(analysis)